@@ -0,0 +1,80 @@
+# bwt_package/background.py
+#-----------------------------------------------------------------#
+#Long-running transforms in a worker process
+#The GUI starts a task, polls it from its event loop without blocking, and can cancel it at any time
+#by terminating the process, which a thread could not do in the middle of a sort.
+#-----------------------------------------------------------------#
+
+import multiprocessing
+
+from bwt_package.instrumentation import add_callback
+
+
+def _run_task(connection, function, args):
+    # Runs in the worker process: reports every finished phase, then the result or the error
+    add_callback(lambda event: connection.send(('phase', event['name'])))
+    try:
+        result = function(*args)
+    except Exception as error:
+        connection.send(('error', f"{type(error).__name__}: {error}"))
+    else:
+        connection.send(('result', result))
+    finally:
+        connection.close()
+
+
+class BackgroundTask:
+    """
+    This class runs function(*args) in a separate process. poll() reads the messages sent by the process
+    without blocking: the name of every phase it finishes (see bwt_package.instrumentation), then its result or error.
+    status is 'running', 'done', 'error' or 'cancelled'; result, error and phase hold the latest values received.
+    function and its result must be picklable, and a script starting tasks must guard its entry point with
+    if __name__ == "__main__": on platforms that spawn processes.
+    """
+
+    def __init__(self, function, *args):
+        self.status = 'running'
+        self.result = None
+        self.error = None
+        self.phase = None
+        self._connection, child_connection = multiprocessing.Pipe(duplex=False)
+        self._process = multiprocessing.Process(target=_run_task, args=(child_connection, function, args), daemon=True)
+        self._process.start()
+        child_connection.close()
+
+    def poll(self):
+        """
+        This function reads the messages that have arrived so far and returns True once the task has finished.
+        """
+        while self.status == 'running' and self._connection.poll():
+            try:
+                kind, value = self._connection.recv()
+            except EOFError:
+                self.status = 'error'
+                self.error = "The worker process stopped unexpectedly"
+                break
+            if kind == 'phase':
+                self.phase = value
+            elif kind == 'result':
+                self.result = value
+                self.status = 'done'
+            else:
+                self.error = value
+                self.status = 'error'
+        if self.status != 'running':
+            self._close()
+            return True
+        return False
+
+    def cancel(self):
+        """
+        This function stops a running task by terminating its process.
+        """
+        if self.status == 'running':
+            self._process.terminate()
+            self.status = 'cancelled'
+        self._close()
+
+    def _close(self):
+        self._process.join()
+        self._connection.close()
@@ -0,0 +1,67 @@
+# bwt_package/backward_search.py
+#-----------------------------------------------------------------#
+#Backward search shared by the indexes over a BWT encoded string
+#FMIndex, RunLengthBWT and DynamicBWT store the BWT differently (Occ checkpoints or a wavelet matrix, runs,
+#a dynamic sequence) but find a pattern the same way, from the C-table and the occurrence counts alone.
+#-----------------------------------------------------------------#
+
+
+class BackwardSearch:
+    """
+    This class adds the LF-mapping, backward search and pattern counting to an index over a BWT encoded string
+    (including its '$'). The index provides the rank queries the search is made of:
+    - __len__(), the number of rows of the BWT matrix;
+    - access(row), the character of the BWT at row;
+    - occ(char, position), the number of occurrences of char in the first position characters of the BWT;
+    - first_row(char), the first row of char in the sorted first column (its C-table entry), or None if char
+      does not occur in the BWT.
+    """
+
+    def lf(self, row):
+        """
+        This function returns the LF-mapping of row: the row of the rotation starting one position earlier in the text.
+        """
+        char = self.access(row)
+        return self.first_row(char) + self.occ(char, row)
+
+    def backward_search(self, pattern):
+        """
+        This function returns the half-open range of rows [top, bottom) of the BWT matrix whose rotations start
+        with pattern, processing the pattern from its last character to its first.
+        """
+        top, bottom = 0, len(self)
+        for char in reversed(pattern):
+            first = self.first_row(char)
+            if first is None:
+                return 0, 0
+            top = first + self.occ(char, top)
+            bottom = first + self.occ(char, bottom)
+            if top >= bottom:
+                return 0, 0
+        return top, bottom
+
+    def count(self, pattern):
+        """
+        This function returns the number of occurrences of pattern in the indexed string.
+        """
+        top, bottom = self.backward_search(pattern)
+        return bottom - top
+
+    def sample_by_lf_walk(self, dollar_row, keep):
+        """
+        This function recovers text positions from the BWT alone, for an index whose suffix array positions
+        were not passed in: it returns a dictionary mapping every row for which keep(row, position) is true
+        to the text position of its rotation, after one LF walk over the whole text.
+        The walk starts from dollar_row, the row ending in '$', which is the rotation starting at position 0;
+        each LF step moves one position back.
+        """
+        n = len(self)
+        samples = {}
+        row = dollar_row
+        position = 0
+        for _ in range(n):
+            if keep(row, position):
+                samples[row] = position
+            row = self.lf(row)
+            position = (position - 1) % n
+        return samples
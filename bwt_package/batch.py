@@ -0,0 +1,97 @@
+# bwt_package/batch.py
+#-----------------------------------------------------------------#
+#Batch transforms of many sequences
+#Sequences are grouped into chunks, every chunk is transformed by one call in a worker process,
+#and the results are streamed back in input order, so millions of short reads cost one
+#inter-process round trip per chunk rather than one Python call and DataFrame per read.
+#-----------------------------------------------------------------#
+
+from itertools import islice
+
+from bwt_package.inverse import lf_inverse
+from bwt_package.lazy import lazy_import
+from bwt_package.streaming import map_blocks
+from bwt_package.suffix_array import bwt_from_suffix_array, suffix_array
+
+#pandas is only imported when a DataFrame is built
+pd = lazy_import('pandas')
+
+#About 1.5 MB of 150 bp reads per chunk
+DEFAULT_CHUNK_SIZE = 10000
+
+
+def iter_chunks(iterable, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    This function groups the items of an iterable into lists of at most chunk_size items.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def bwt_chunk(strings, engine='auto'):
+    """
+    This function returns the BWT encoded string of every string in a list, without building the matrix views.
+    """
+    encoded = []
+    for string in strings:
+        string += '$'
+        encoded.append(bwt_from_suffix_array(string, suffix_array(string, engine)))
+    return encoded
+
+
+def bwt_inverse_chunk(encoded_strings):
+    """
+    This function returns the original string of every BWT encoded string in a list ('$' is added when missing).
+    """
+    return [lf_inverse(encoded if '$' in encoded else encoded + '$') for encoded in encoded_strings]
+
+
+def bwt_many(strings, engine='auto', chunk_size=DEFAULT_CHUNK_SIZE, workers=None):
+    """
+    This function is a generator yielding the BWT encoded string of every string of an iterable, in input order.
+    The strings are sent to workers processes (one per core by default) in chunks of chunk_size, and only a few
+    chunks are in flight at a time, so the iterable may be a stream of any length.
+    """
+    chunks = ((chunk, engine) for chunk in iter_chunks(strings, chunk_size))
+    for encoded in map_blocks(bwt_chunk, chunks, workers):
+        yield from encoded
+
+
+def bwt_inverse_many(encoded_strings, chunk_size=DEFAULT_CHUNK_SIZE, workers=None):
+    """
+    This function is a generator yielding the original string of every BWT encoded string of an iterable,
+    in input order, processed in chunks by a pool of workers as in bwt_many().
+    """
+    chunks = ((chunk,) for chunk in iter_chunks(encoded_strings, chunk_size))
+    for original in map_blocks(bwt_inverse_chunk, chunks, workers):
+        yield from original
+
+
+def bwt_many_frame(strings, engine='auto', chunk_size=DEFAULT_CHUNK_SIZE, workers=None):
+    """
+    This function transforms every string of an iterable with bwt_many() and returns a single Pandas DataFrame
+    with one row per string and the columns 'Sequence' and 'BWT'.
+    """
+    strings = list(strings)
+    return pd.DataFrame({
+        'Sequence': strings,
+        'BWT': list(bwt_many(strings, engine, chunk_size, workers)),
+    })
+
+
+def bwt_inverse_many_frame(encoded_strings, chunk_size=DEFAULT_CHUNK_SIZE, workers=None):
+    """
+    This function inverts every BWT encoded string of an iterable with bwt_inverse_many() and returns a single
+    Pandas DataFrame with one row per string and the columns 'BWT' and 'Original Sequence'.
+    """
+    encoded_strings = list(encoded_strings)
+    return pd.DataFrame({
+        'BWT': encoded_strings,
+        'Original Sequence': list(bwt_inverse_many(encoded_strings, chunk_size, workers)),
+    })
@@ -0,0 +1,194 @@
+# bwt_package/benchmark.py
+#-----------------------------------------------------------------#
+#Benchmark suite for the forward and inverse transforms
+#Sweeps input sizes, alphabets and suffix array engines, times every case with warmup runs and
+#repeated perf_counter_ns measurements, and compares the results with a stored JSON baseline.
+#Run with: python -m bwt_package.benchmark --output results.json --baseline baseline.json
+#-----------------------------------------------------------------#
+
+import argparse
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+from bwt_package.inverse import lf_inverse
+from bwt_package.prefix_doubling import np
+from bwt_package.suffix_array import available_engines, bwt_from_suffix_array, engine_choices, suffix_array
+
+FORMAT_VERSION = 1
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000, 1000000, 10000000]
+#Characters used to generate the inputs of each alphabet ('$' is left out, as it terminates the string)
+ALPHABETS = {
+    'dna': 'ACGT',
+    'protein': 'ACDEFGHIKLMNPQRSTVWY',
+    'text': ''.join(chr(code) for code in range(32, 127) if chr(code) != '$'),
+    'repetitive': 'AT',
+}
+#The 'naive' and 'sort' engines hold every rotation or suffix in memory, so they are only run up to these sizes
+ENGINE_MAX_SIZE = {'naive': 1000, 'sort': 10000}
+DEFAULT_THRESHOLD = 0.10
+
+
+def make_input(alphabet, size, seed=0):
+    """
+    This function returns a string of size characters for one of the ALPHABETS: random characters for 'dna',
+    'protein' and 'text', and the periodic string ATATAT... for 'repetitive'.
+    """
+    characters = ALPHABETS[alphabet]
+    if alphabet == 'repetitive':
+        return (characters * (size // len(characters) + 1))[:size]
+    generator = random.Random(seed)
+    return ''.join(generator.choices(characters, k=size))
+
+
+def time_call(function, argument, repeat=5, warmup=1):
+    """
+    This function calls function(argument) warmup times without timing it, then repeat times with
+    time.perf_counter_ns(), with the garbage collector paused as timeit does. It returns the timings in nanoseconds.
+    """
+    for _ in range(warmup):
+        function(argument)
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter_ns()
+            function(argument)
+            timings.append(time.perf_counter_ns() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return timings
+
+
+def _forward(engine):
+    def transform(string):
+        return bwt_from_suffix_array(string, suffix_array(string, engine))
+    return transform
+
+
+def run_benchmark(sizes=None, alphabets=None, engines=None, repeat=5, warmup=1, seed=0, progress=None):
+    """
+    This function times the forward transform with every engine and the LF-mapping inverse for every
+    alphabet and size, and returns one dictionary per case with its min, median and mean time in nanoseconds
+    and its throughput in MB/s (taken from the median). progress, if given, is called with every result.
+    """
+    sizes = DEFAULT_SIZES if sizes is None else sizes
+    alphabets = list(ALPHABETS) if alphabets is None else alphabets
+    engines = available_engines() if engines is None else engines
+    results = []
+    for alphabet in alphabets:
+        for size in sizes:
+            string = make_input(alphabet, size, seed) + '$'
+            bwt_encoded = _forward('auto')(string)
+            cases = [('bwt', engine, _forward(engine), string) for engine in engines
+                     if size <= ENGINE_MAX_SIZE.get(engine, size)]
+            cases.append(('inverse', 'lf', lf_inverse, bwt_encoded))
+            for operation, engine, function, argument in cases:
+                timings = time_call(function, argument, repeat, warmup)
+                median = statistics.median(timings)
+                result = {
+                    'operation': operation,
+                    'engine': engine,
+                    'alphabet': alphabet,
+                    'size': size,
+                    'repeat': repeat,
+                    'min_ns': min(timings),
+                    'median_ns': median,
+                    'mean_ns': statistics.mean(timings),
+                    'mb_per_s': size / 1e6 / (median / 1e9) if median else float('inf'),
+                }
+                results.append(result)
+                if progress is not None:
+                    progress(result)
+    return results
+
+
+def _case_key(result):
+    return result['operation'], result['engine'], result['alphabet'], result['size']
+
+
+def compare_with_baseline(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    This function matches every result with the baseline result of the same operation, engine, alphabet and size,
+    and returns the cases whose median time grew by more than threshold (0.10 means 10% slower),
+    each with its baseline and current median and their ratio. Cases missing from the baseline are skipped.
+    """
+    baseline_medians = {_case_key(result): result['median_ns'] for result in baseline['results']}
+    regressions = []
+    for result in results:
+        before = baseline_medians.get(_case_key(result))
+        if not before:
+            continue
+        ratio = result['median_ns'] / before
+        if ratio > 1 + threshold:
+            regressions.append(dict(result, baseline_median_ns=before, ratio=ratio))
+    return regressions
+
+
+def report(results):
+    """
+    This function wraps benchmark results in the JSON document written by --output, with the details of the
+    interpreter and machine they were measured on.
+    """
+    return {
+        'version': FORMAT_VERSION,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'numpy': np.__version__ if np is not None else None,
+        'results': results,
+    }
+
+
+def _print_result(result):
+    print(f"{result['operation']:>8} {result['engine']:>6} {result['alphabet']:>10} {result['size']:>10} "
+          f"{result['median_ns'] / 1e6:>12.3f} {result['mb_per_s']:>10.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the BWT and inverse BWT across sizes, alphabets and engines')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Input sizes in characters')
+    parser.add_argument('--max-size', type=int, default=None, help='Skip the sizes larger than this')
+    parser.add_argument('--alphabets', nargs='+', default=list(ALPHABETS), choices=list(ALPHABETS), help='Input alphabets')
+    parser.add_argument('--engines', nargs='+', default=available_engines(), choices=engine_choices(),
+                        help='Suffix array engines for the forward transform')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per case')
+    parser.add_argument('--warmup', type=int, default=1, help='Untimed runs per case before timing')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the random inputs')
+    parser.add_argument('--output', type=str, default=None, help='Write the results to this JSON file')
+    parser.add_argument('--baseline', type=str, default=None, help='JSON file of earlier results to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Relative slowdown of the median reported as a regression (default: 0.10)')
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    sizes = [size for size in args.sizes if args.max_size is None or size <= args.max_size]
+    print(f"{'Op':>8} {'Engine':>6} {'Alphabet':>10} {'Size':>10} {'Median (ms)':>12} {'MB/s':>10}")
+    results = run_benchmark(sizes, args.alphabets, args.engines, args.repeat, args.warmup, args.seed, _print_result)
+
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(report(results), handle, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+        regressions = compare_with_baseline(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression['operation']} {regression['engine']} {regression['alphabet']} "
+                  f"{regression['size']}: {regression['baseline_median_ns'] / 1e6:.3f} ms -> "
+                  f"{regression['median_ns'] / 1e6:.3f} ms ({regression['ratio']:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions above {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
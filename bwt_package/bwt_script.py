@@ -1,62 +1,80 @@
 # bwt_package/bwt_script.py
 
-import pandas as pd
-
-def bwt(string):
-    string += '$'
-    indices = [string[i:] + string[:i] for i in range(len(string))]
-    sorted_indices = sorted(indices)
-    bwt_encoded = ''.join(sorted_indices[-1][-1] for sorted_indices in sorted_indices)
-    matrix = pd.DataFrame({
-        "Possible rotations": indices,
-        "Sorted": sorted_indices
-    })
-    return matrix, bwt_encoded
-
-def bwt_inverse(bwt_encoded):
-    if '$' not in bwt_encoded:
-        bwt_encoded += '$'
-    ln = len(bwt_encoded)
-    tuples = [(char, i) for i, char in enumerate(bwt_encoded)]
-    tuples.sort()
-    column_1 = [char for char, n in tuples]
-    current_BWT_row = tuples[bwt_encoded.index('$')][1]
-    string_original = ''
-    for n in range(ln):
-        string_original = column_1[current_BWT_row] + string_original
-        current_BWT_row = tuples[current_BWT_row][1]
-    sorted_indices = sorted(range(ln), key=lambda x: bwt_encoded[x])
-    current_index = sorted_indices[bwt_encoded.index('$')]
-    string_original = ''
-    for _ in range(ln - 1):
-        string_original += bwt_encoded[current_index]
-        current_index = sorted_indices[current_index]
-    df = pd.DataFrame({
-        "First Column": column_1,
-        "Original Sequence Column": list(bwt_encoded)
-    })
-    return df, string_original
-
-def calculate_size(input_string):
-    size_in_bytes = len(input_string.encode('utf-8'))
-    return size_in_bytes
-
-def measure_compression(input_sequence):
-    _, bwt_encoded = bwt(input_sequence)
-    _, string_original = bwt_inverse(bwt_encoded)
-
-    original_size = len(input_sequence)
-    compressed_size = len(bwt_encoded)
-    compression_rate = compressed_size / original_size if original_size != 0 else 0
-
-    return pd.DataFrame({
-        'Sequence': [input_sequence],
-        'Original Sequence': [string_original],
-        'SequenceLength': [original_size],
-        'CompressionRate': [compression_rate * 100]  # Multiply by 100 to represent as percentage
-    })
-
-def main():
+import argparse
+import sys
+
+
+from bwt_package.core import bwt, bwt_inverse, calculate_size, measure_compression
+from bwt_package.mmap_io import bwt_inverse_mapped_file, bwt_to_mapped_file, fetch_region, load_fai, map_file, parse_region
+from bwt_package.streaming import DEFAULT_BLOCK_SIZE, bwt_inverse_stream, bwt_stream
+from bwt_package.suffix_array import BLOCK_ENGINES, engine_choices
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='BWT Programming')
+    parser.add_argument('--stream', nargs=2, metavar=('INPUT', 'OUTPUT'),
+                        help='Transform INPUT block by block into the framed BWT stream OUTPUT instead of running interactively')
+    parser.add_argument('--mmap', nargs=2, metavar=('INPUT', 'OUTPUT'),
+                        help='Transform INPUT as a single block through memory-mapped files instead of running interactively')
+    parser.add_argument('--region', type=str, default=None,
+                        help='With --mmap, transform only a FASTA sequence or region such as chr1:1000-2000 (uses INPUT.fai)')
+    parser.add_argument('--inverse', action='store_true', help='With --stream or --mmap, decode the output back to the original file')
+    parser.add_argument('--block-size', type=int, default=DEFAULT_BLOCK_SIZE, help='Block size in bytes for --stream')
+    parser.add_argument('--engine', type=str, default='auto', choices=engine_choices(),
+                        help=f"Suffix array engine used by the BWT (--stream and --mmap accept auto, {', '.join(BLOCK_ENGINES)})")
+    parser.add_argument('--workers', type=int, default=None, help='Number of processes used for --stream (default: number of cores)')
+    args = parser.parse_args(argv)
+    if (args.stream or args.mmap) and not args.inverse and args.engine not in ['auto'] + BLOCK_ENGINES:
+        # Blocks are sorted as bytes with a virtual terminator, which only the block engines support
+        parser.error(f"--engine {args.engine} cannot be used with --stream or --mmap; choose auto, {', '.join(BLOCK_ENGINES)}")
+    return args
+
+def run_stream(args):
+    input_path, output_path = args.stream
+    with open(input_path, 'rb') as infile, open(output_path, 'wb') as outfile:
+        if args.inverse:
+            blocks = bwt_inverse_stream(infile, outfile, args.workers)
+        else:
+            blocks = bwt_stream(infile, outfile, args.block_size, args.engine, args.workers)
+    print(f"Processed {blocks} block(s) from {input_path} into {output_path}")
+
+def run_mmap(args):
+    input_path, output_path = args.mmap
+    if args.inverse:
+        size = bwt_inverse_mapped_file(input_path, output_path)
+        print(f"Decoded {size} byte(s) from {input_path} into {output_path}")
+        return
+    mapped = map_file(input_path)
+    try:
+        if args.region:
+            try:
+                name, start, end = parse_region(args.region)
+            except ValueError as error:
+                sys.exit(f"bwt_script: error: --region: {error}")
+            entries = load_fai(input_path)
+            if name not in entries:
+                # A usage error rather than a traceback, like the errors reported by the argument parser
+                sys.exit(f"bwt_script: error: --region: sequence '{name}' not found in {input_path}.fai")
+            data = fetch_region(mapped, entries[name], start, end)
+        else:
+            data = mapped
+        bwt_to_mapped_file(data, output_path, args.engine)
+        size = len(data)
+        del data
+    finally:
+        if not isinstance(mapped, bytes):
+            mapped.close()
+    print(f"Transformed {size} byte(s) from {input_path} into {output_path}")
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.stream:
+        run_stream(args)
+        return
+    if args.mmap:
+        run_mmap(args)
+        return
+
     strings_to_process = [
         "GATTACA",
         "ATTACATTAC",
@@ -84,7 +102,7 @@ def main():
 
         if option == '1':
             user_input = input("Please enter the sequence: ").strip()
-            bwt_result, bwt_encoded = bwt(user_input)
+            bwt_result, bwt_encoded = bwt(user_input, args.engine)
             user_input_2 = input("Do you want to see all the possible permutations sorted? ").strip().lower()
             if user_input_2 in ["yes", "y"]:
                 print("\nHere are all the possible permutations and sorted form: ")
@@ -0,0 +1,163 @@
+# bwt_package/cache.py
+#-----------------------------------------------------------------#
+#Least recently used cache of transform results, bounded by bytes
+#bwt() and bwt_inverse() are looked up by a hash of their input first, so a sequence that was
+#just transformed (e.g. by the GUI, which shows the result in a second step) is not sorted again.
+#-----------------------------------------------------------------#
+
+import functools
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+from bwt_package.dna import PackedDNA
+
+#64 MB of cached results by default
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def input_key(name, value, options=()):
+    """
+    This function returns the cache key of a call to the function name with value as input:
+    the function name, the type of the value, a 128-bit BLAKE2 digest of the value and the other arguments
+    of the call (options). A str is hashed encoded as UTF-8; a PackedDNA is hashed from its packed bytes and runs,
+    without decoding it back to a string.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(value, PackedDNA):
+        digest.update(value.length.to_bytes(8, 'little'))
+        digest.update(value.packed)
+        runs = (value.exception_starts, value.exception_ends, value.exception_chars, value.mask_starts, value.mask_ends)
+        digest.update(repr(runs).encode('utf-8'))
+    else:
+        digest.update(str(value).encode('utf-8'))
+    return name, type(value).__name__, digest.digest(), options
+
+
+def estimate_size(value):
+    """
+    This function estimates the memory held by a cached result in bytes, using the nbytes of objects that
+    report one (the matrix views, PackedDNA) and sys.getsizeof() for anything else.
+    """
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    size = getattr(value, 'nbytes', None)
+    return size if size is not None else sys.getsizeof(value)
+
+
+class LRUCache:
+    """
+    This class keeps results in least recently used order until their estimated sizes add up to more than
+    max_bytes, then evicts the oldest ones. Results larger than max_bytes are never stored.
+    hits, misses and evictions count the lookups and removals since the cache was created or cleared.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        if max_bytes < 0:
+            raise ValueError("max_bytes must not be negative")
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """
+        This function returns the result stored under key and marks it as the most recently used,
+        or default if it is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size=None):
+        """
+        This function stores value under key, evicting the least recently used results until it fits.
+        """
+        size = estimate_size(value) if size is None else size
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            while self.current_bytes + size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+
+    def clear(self):
+        """
+        This function removes every result and resets the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def resize(self, max_bytes):
+        """
+        This function changes the byte limit, evicting the least recently used results that no longer fit.
+        """
+        with self._lock:
+            self.max_bytes = max_bytes
+            while self._entries and self.current_bytes > max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def stats(self):
+        """
+        This function returns the counters and the current size of the cache as a dictionary.
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self.current_bytes,
+            'max_bytes': self.max_bytes,
+        }
+
+
+#Cache shared by bwt() and bwt_inverse() in every frontend
+transform_cache = LRUCache()
+
+
+def cached(name, cache=None):
+    """
+    This function is a decorator looking up the result of the decorated function in cache (transform_cache by
+    default) by a hash of its first argument and the values of the other arguments. Arguments such as the suffix
+    array engine do not change the BWT, but they do change the result kept (e.g. a NumPy or list suffix array
+    in the matrix view), so each is cached under its own key.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(value, *args, **kwargs):
+            store = transform_cache if cache is None else cache
+            if store.max_bytes == 0:
+                return function(value, *args, **kwargs)
+            key = input_key(name, value, args + tuple(sorted(kwargs.items())))
+            result = store.get(key)
+            if result is None:
+                result = function(value, *args, **kwargs)
+                store.put(key, result)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,356 @@
+# bwt_package/codec.py
+#-----------------------------------------------------------------#
+#Compression pipeline built on the Burrows-Wheeler Transform
+#BWT -> move-to-front -> zero run-length encoding (bzip2 RUNA/RUNB) -> canonical Huffman coding.
+#The BWT only groups equal characters together; the later stages are what actually shrink the data.
+#-----------------------------------------------------------------#
+
+import heapq
+import time
+
+from bwt_package.instrumentation import instrumented
+from bwt_package.streaming import DEFAULT_BLOCK_SIZE, bwt_block, bwt_inverse_block
+
+#Stream layout: MAGIC, then for every block its header (block length, primary index, symbol count and payload size
+#as variable-length integers), its table of Huffman code lengths and its Huffman payload
+MAGIC = b'BWTZ\x02'
+STAGES = ['BWT', 'MTF', 'RLE', 'Huffman']
+#RLE alphabet: RUNA and RUNB encode runs of zeros, a non-zero MTF value v is written as v + 1
+RUNA = 0
+RUNB = 1
+ALPHABET_SIZE = 257
+#The code length table marks the used symbols in groups of 16, as bzip2 does
+_GROUP_SIZE = 16
+_GROUPS = -(-ALPHABET_SIZE // _GROUP_SIZE)
+
+
+@instrumented('move_to_front')
+def move_to_front(data):
+    """
+    This function replaces every byte by its position in a list of recently seen bytes, then moves it to the front.
+    Runs of equal bytes, which the BWT creates, become runs of zeros.
+    """
+    table = bytearray(range(256))
+    encoded = bytearray(len(data))
+    for i, byte in enumerate(data):
+        index = table.index(byte)
+        encoded[i] = index
+        if index:
+            del table[index]
+            table.insert(0, byte)
+    return bytes(encoded)
+
+
+@instrumented('inverse_move_to_front')
+def inverse_move_to_front(encoded):
+    """
+    This function reverses move_to_front().
+    """
+    table = bytearray(range(256))
+    data = bytearray(len(encoded))
+    for i, index in enumerate(encoded):
+        byte = table[index]
+        data[i] = byte
+        if index:
+            del table[index]
+            table.insert(0, byte)
+    return bytes(data)
+
+
+@instrumented('run_length_encode')
+def run_length_encode(encoded):
+    """
+    This function turns move-to-front output into RLE symbols: every run of zeros is written as its length in
+    bijective base 2 using RUNA (1) and RUNB (2) digits, and every other value v as the symbol v + 1.
+    """
+    symbols = []
+    run = 0
+    for value in encoded:
+        if value == 0:
+            run += 1
+            continue
+        if run:
+            _append_run(symbols, run)
+            run = 0
+        symbols.append(value + 1)
+    if run:
+        _append_run(symbols, run)
+    return symbols
+
+
+def _append_run(symbols, run):
+    while run > 0:
+        if run & 1:
+            symbols.append(RUNA)
+            run = (run - 1) >> 1
+        else:
+            symbols.append(RUNB)
+            run = (run - 2) >> 1
+
+
+@instrumented('run_length_decode')
+def run_length_decode(symbols):
+    """
+    This function reverses run_length_encode().
+    """
+    encoded = bytearray()
+    run = 0
+    weight = 1
+    for symbol in symbols:
+        if symbol <= RUNB:
+            run += weight << symbol
+            weight <<= 1
+            continue
+        if run:
+            encoded.extend(bytes(run))
+            run = 0
+            weight = 1
+        encoded.append(symbol - 1)
+    if run:
+        encoded.extend(bytes(run))
+    return bytes(encoded)
+
+
+@instrumented('huffman_code_lengths')
+def huffman_code_lengths(symbols):
+    """
+    This function returns the Huffman code length of every symbol of the RLE alphabet (0 for unused symbols).
+    """
+    frequencies = [0] * ALPHABET_SIZE
+    for symbol in symbols:
+        frequencies[symbol] += 1
+    heap = [(frequency, [symbol]) for symbol, frequency in enumerate(frequencies) if frequency]
+    lengths = [0] * ALPHABET_SIZE
+    if len(heap) == 1:
+        lengths[heap[0][1][0]] = 1
+        return lengths
+    heapq.heapify(heap)
+    while len(heap) > 1:
+        frequency_a, group_a = heapq.heappop(heap)
+        frequency_b, group_b = heapq.heappop(heap)
+        for symbol in group_a + group_b:
+            lengths[symbol] += 1
+        heapq.heappush(heap, (frequency_a + frequency_b, group_a + group_b))
+    return lengths
+
+
+def _canonical_codes(lengths):
+    # Canonical Huffman: codes are assigned in order of (length, symbol)
+    codes = {}
+    code = 0
+    previous_length = 0
+    for length, symbol in sorted((length, symbol) for symbol, length in enumerate(lengths) if length):
+        code <<= length - previous_length
+        codes[symbol] = (code, length)
+        code += 1
+        previous_length = length
+    return codes
+
+
+@instrumented('huffman_encode')
+def huffman_encode(symbols, lengths):
+    """
+    This function writes the symbols with the canonical Huffman codes given by lengths and returns the packed bytes.
+    """
+    codes = {symbol: format(code, f'0{length}b') for symbol, (code, length) in _canonical_codes(lengths).items()}
+    bits = ''.join([codes[symbol] for symbol in symbols])
+    padding = -len(bits) % 8
+    bits += '0' * padding
+    return int(bits, 2).to_bytes(len(bits) // 8, 'big') if bits else b''
+
+
+@instrumented('huffman_decode')
+def huffman_decode(payload, lengths, symbol_count):
+    """
+    This function reads symbol_count symbols written by huffman_encode() from payload.
+    """
+    decoding = {(length, code): symbol for symbol, (code, length) in _canonical_codes(lengths).items()}
+    bits = format(int.from_bytes(payload, 'big'), f'0{len(payload) * 8}b') if payload else ''
+    symbols = []
+    code = 0
+    length = 0
+    for bit in bits:
+        if len(symbols) == symbol_count:
+            break
+        code = (code << 1) | (bit == '1')
+        length += 1
+        symbol = decoding.get((length, code))
+        if symbol is not None:
+            symbols.append(symbol)
+            code = 0
+            length = 0
+    if len(symbols) != symbol_count:
+        raise ValueError("Truncated Huffman payload")
+    return symbols
+
+
+def encode_code_lengths(lengths):
+    """
+    This function serialises the Huffman code lengths of the used symbols only, the way bzip2 does: a bitmap of
+    the groups of 16 symbols that contain a used symbol, a 16-bit map of the used symbols of each such group,
+    then the first code length in 5 bits and every code length as a delta from the previous one
+    ('10' adds 1, '11' subtracts 1, '0' moves to the next symbol). A short block costs a few bytes instead of
+    one byte per symbol of the alphabet. Code lengths above 31 (Huffman codes of very skewed blocks) are
+    written as deltas too, so every non-negative length is kept.
+    """
+    if any(length < 0 for length in lengths):
+        raise ValueError("Huffman code lengths must not be negative")
+    used = [symbol for symbol, length in enumerate(lengths) if length]
+    groups = {symbol // _GROUP_SIZE for symbol in used}
+    bits = [''.join('1' if group in groups else '0' for group in range(_GROUPS))]
+    for group in sorted(groups):
+        symbols = range(group * _GROUP_SIZE, (group + 1) * _GROUP_SIZE)
+        bits.append(''.join('1' if symbol < ALPHABET_SIZE and lengths[symbol] else '0' for symbol in symbols))
+    # The 5-bit start is capped at 31; a longer first code length is reached by its delta like the others
+    current = min(lengths[used[0]], 31) if used else 0
+    bits.append(format(current, '05b'))
+    for symbol in used:
+        length = lengths[symbol]
+        bits.append(('10' if length > current else '11') * abs(length - current) + '0')
+        current = length
+    bits = ''.join(bits)
+    bits += '0' * (-len(bits) % 8)
+    return int(bits, 2).to_bytes(len(bits) // 8, 'big')
+
+
+def decode_code_lengths(data, offset=0):
+    """
+    This function reads a table written by encode_code_lengths() from data at offset and returns the list of
+    code lengths of the whole alphabet with the offset of the first byte after the table.
+    """
+    position = offset * 8
+
+    def read(count):
+        nonlocal position
+        value = 0
+        for _ in range(count):
+            if position >> 3 >= len(data):
+                raise ValueError("Truncated BWT compressed data")
+            value = (value << 1) | ((data[position >> 3] >> (7 - (position & 7))) & 1)
+            position += 1
+        return value
+
+    groups = [group for group in range(_GROUPS) if read(1)]
+    used = []
+    for group in groups:
+        for symbol in range(group * _GROUP_SIZE, (group + 1) * _GROUP_SIZE):
+            if read(1):
+                if symbol >= ALPHABET_SIZE:
+                    raise ValueError("Corrupt Huffman code length table")
+                used.append(symbol)
+    lengths = [0] * ALPHABET_SIZE
+    current = read(5)
+    for symbol in used:
+        while read(1):
+            current += -1 if read(1) else 1
+        if current <= 0:
+            raise ValueError("Corrupt Huffman code length table")
+        lengths[symbol] = current
+    return lengths, -(-position // 8)
+
+
+def _encode_varint(value):
+    # Unsigned LEB128: 7 bits per byte, the high bit set on every byte but the last
+    encoded = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            encoded.append(byte | 0x80)
+        else:
+            encoded.append(byte)
+            return bytes(encoded)
+
+
+def _decode_varint(data, offset):
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("Truncated BWT compressed data")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+
+@instrumented('compress')
+def compress_with_stats(data, block_size=DEFAULT_BLOCK_SIZE, engine='auto'):
+    """
+    This function compresses a bytes object and returns the compressed bytes together with a dictionary of the
+    time in seconds spent in each stage of the pipeline (keys from STAGES).
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    if block_size <= 0:
+        raise ValueError("block_size must be a positive number of bytes")
+    stage_times = dict.fromkeys(STAGES, 0.0)
+    output = [MAGIC]
+    for start in range(0, len(data), block_size):
+        block = data[start:start + block_size]
+
+        started = time.perf_counter()
+        primary_index, encoded = bwt_block(block, engine)
+        stage_times['BWT'] += time.perf_counter() - started
+
+        started = time.perf_counter()
+        encoded = move_to_front(encoded)
+        stage_times['MTF'] += time.perf_counter() - started
+
+        started = time.perf_counter()
+        symbols = run_length_encode(encoded)
+        stage_times['RLE'] += time.perf_counter() - started
+
+        started = time.perf_counter()
+        lengths = huffman_code_lengths(symbols)
+        payload = huffman_encode(symbols, lengths)
+        stage_times['Huffman'] += time.perf_counter() - started
+
+        output.extend(_encode_varint(value) for value in (len(block), primary_index, len(symbols), len(payload)))
+        output.append(encode_code_lengths(lengths))
+        output.append(payload)
+    return b''.join(output), stage_times
+
+
+def compress(data, block_size=DEFAULT_BLOCK_SIZE, engine='auto'):
+    """
+    This function compresses a bytes object (or a string, encoded as UTF-8) and returns the compressed bytes.
+    """
+    return compress_with_stats(data, block_size, engine)[0]
+
+
+@instrumented('decompress')
+def decompress(compressed):
+    """
+    This function reverses compress() and returns the original bytes.
+    """
+    if compressed[:len(MAGIC)] != MAGIC:
+        raise ValueError("Input is not BWT compressed data (bad magic number)")
+    offset = len(MAGIC)
+    blocks = []
+    while offset < len(compressed):
+        header = []
+        for _ in range(4):
+            value, offset = _decode_varint(compressed, offset)
+            header.append(value)
+        length, primary_index, symbol_count, payload_size = header
+        lengths, offset = decode_code_lengths(compressed, offset)
+        payload = compressed[offset:offset + payload_size]
+        if len(payload) != payload_size:
+            raise ValueError("Truncated BWT compressed data")
+        offset += payload_size
+
+        encoded = inverse_move_to_front(run_length_decode(huffman_decode(payload, lengths, symbol_count)))
+        if len(encoded) != length:
+            raise ValueError("Corrupt BWT compressed block")
+        blocks.append(bwt_inverse_block(encoded, primary_index))
+    return b''.join(blocks)
+
+
+def throughput(size, seconds):
+    """
+    This function converts a number of bytes processed in seconds into megabytes per second.
+    """
+    return size / 1e6 / seconds if seconds > 0 else float('inf')
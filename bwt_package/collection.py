@@ -0,0 +1,169 @@
+# bwt_package/collection.py
+#-----------------------------------------------------------------#
+#Multi-string BWT of a read collection (BCR algorithm)
+#Every read ends with its own terminator; the terminators sort as '$' against the other characters and
+#among themselves by read number. The BWT is built column by column from the last character of the reads
+#to the first, merging one character per read into the BWT at every column, so memory grows with
+#the BWT itself rather than with the rotations of the concatenated reads.
+#-----------------------------------------------------------------#
+
+from collections import Counter
+
+from bwt_package.fm_index import DEFAULT_OCC_SAMPLE_RATE, FMIndex
+
+
+def bcr_bwt(sequences):
+    """
+    This function returns the extended BWT of a list of sequences with the BCR algorithm of Bauer, Cox and Rosone.
+    Column j holds the j-th last character of every read still long enough: each one is inserted at the row
+    given by the LF-mapping of the suffix inserted for the same read in the previous column, and the character
+    inserted at that row is the one that precedes it in the read, or '$' once the read is complete.
+    Every column is one pass over the BWT built so far, so the time grows with the total length of the reads
+    times the length of the longest one; the method suits read collections rather than long sequences.
+    A collection of a single sequence gives the same BWT as bwt().
+    """
+    for sequence in sequences:
+        if '$' in sequence:
+            raise ValueError("Sequences of a collection cannot contain the EOF character '$'")
+    reads = len(sequences)
+    # Column 0: the suffix made of the terminator alone of every read, preceded by the last character of the read
+    bwt_encoded = ''.join(sequence[-1:] or '$' for sequence in sequences)
+    totals = Counter(bwt_encoded)
+    rows = list(range(reads))
+    active = [read for read in range(reads) if sequences[read]]
+    column = 1
+    while active:
+        # First row of every character in the first column; the terminators of all reads sort as '$',
+        # including those of the reads that are not complete yet
+        first_rows = {}
+        total = 0
+        for char in sorted(totals):
+            if char == '$':
+                continue
+            if '$' < char and '$' not in first_rows:
+                first_rows['$'] = total
+                total += reads
+            first_rows[char] = total
+            total += totals[char]
+
+        # The rows of the previous column are visited in order, counting the characters in between
+        active.sort(key=rows.__getitem__)
+        ranks = dict.fromkeys({sequences[read][-column] for read in active}, 0)
+        insertions = []
+        previous = 0
+        for read in active:
+            row = rows[read]
+            for char in ranks:
+                ranks[char] += bwt_encoded.count(char, previous, row)
+            previous = row
+            char = sequences[read][-column]
+            insertions.append((first_rows[char] + ranks[char], read))
+
+        # Merging the new characters into the BWT at their final rows
+        insertions.sort()
+        pieces = []
+        start = 0
+        for inserted, (row, read) in enumerate(insertions):
+            sequence = sequences[read]
+            char = sequence[-column - 1] if column < len(sequence) else '$'
+            pieces.append(bwt_encoded[start:row - inserted])
+            pieces.append(char)
+            start = row - inserted
+            totals[char] += 1
+            rows[read] = row
+        pieces.append(bwt_encoded[start:])
+        bwt_encoded = ''.join(pieces)
+        column += 1
+        active = [read for read in active if len(sequences[read]) >= column]
+    return bwt_encoded
+
+
+class CollectionBWT:
+    """
+    This class is the extended BWT of a collection of reads, built with bcr_bwt(), together with the mapping
+    from rows back to the reads. The FM-index ranks of bwt_encoded answer count() by backward search;
+    a row is mapped to its read by walking the LF-mapping back to the row of the whole read, whose BWT
+    character is the terminator of the read, and terminator_reads gives the read of every terminator
+    in the order in which they appear in the BWT.
+    """
+
+    def __init__(self, bwt_encoded, ids, terminator_reads, occ_sample_rate=DEFAULT_OCC_SAMPLE_RATE,
+                 rank_backend='checkpoints'):
+        self.bwt_encoded = bwt_encoded
+        self.ids = ids
+        self.terminator_reads = terminator_reads
+        # The rank structure of an FM-index; rows are located through the terminators instead of suffix array samples
+        self.index = FMIndex(bwt_encoded, occ_sample_rate, positions=[], rank_backend=rank_backend)
+
+    @classmethod
+    def from_records(cls, records, occ_sample_rate=DEFAULT_OCC_SAMPLE_RATE, rank_backend='checkpoints'):
+        """
+        This function builds the collection BWT of (record_id, sequence) tuples, as yielded by
+        bwt_package.fastx.read_fastx() for the reads of a FASTA/FASTQ file.
+        """
+        ids = []
+        sequences = []
+        for record_id, sequence in records:
+            ids.append(record_id)
+            sequences.append(sequence)
+        bwt_encoded = bcr_bwt(sequences)
+        index = cls(bwt_encoded, ids, [], occ_sample_rate, rank_backend)
+        # The terminator row of read i is the i-th '$' row of the first column; one LF walk per read leads to
+        # the row of the whole read, whose rank among the '$' of the BWT gives the position of the read in the list
+        terminator_reads = [0] * len(sequences)
+        first = index.index.c_table.get('$', 0)
+        for read, sequence in enumerate(sequences):
+            row = first + read
+            for _ in range(len(sequence)):
+                row = index.index.lf(row)
+            terminator_reads[index.index.occ('$', row)] = read
+        index.terminator_reads = terminator_reads
+        return index
+
+    @classmethod
+    def from_sequences(cls, sequences, occ_sample_rate=DEFAULT_OCC_SAMPLE_RATE, rank_backend='checkpoints'):
+        """
+        This function builds the collection BWT of a list of sequences, identified by their position in the list.
+        """
+        return cls.from_records(((str(read), sequence) for read, sequence in enumerate(sequences)),
+                                occ_sample_rate, rank_backend)
+
+    def __len__(self):
+        return len(self.bwt_encoded)
+
+    def count(self, pattern):
+        """
+        This function returns the number of occurrences of pattern in all the reads together.
+        """
+        return self.index.count(pattern)
+
+    def read_of_row(self, row):
+        """
+        This function returns the read number and the offset in the read of the suffix sorted at row.
+        """
+        offset = 0
+        while self.bwt_encoded[row] != '$':
+            row = self.index.lf(row)
+            offset += 1
+        return self.terminator_reads[self.index.occ('$', row)], offset
+
+    def locate(self, pattern):
+        """
+        This function returns the sorted list of (record_id, offset) pairs at which pattern occurs in the reads.
+        Every occurrence is walked back to the start of its read, so a query costs one LF step per character
+        before the occurrence; this suits short reads rather than long sequences.
+        """
+        top, bottom = self.index.backward_search(pattern)
+        located = []
+        for row in range(top, bottom):
+            read, offset = self.read_of_row(row)
+            located.append((read, offset))
+        return [(self.ids[read], offset) for read, offset in sorted(located)]
+
+    def terminator_rows(self):
+        """
+        This function returns (row, record_id) pairs for the rows whose BWT character is a terminator:
+        the row of every whole read, in row order.
+        """
+        rows = [row for row, char in enumerate(self.bwt_encoded) if char == '$']
+        return [(row, self.ids[read]) for row, read in zip(rows, self.terminator_reads)]
@@ -0,0 +1,118 @@
+# bwt_package/core.py
+#-----------------------------------------------------------------#
+#Single implementation of the functions shared by every frontend
+#main.py, main_bwt_ms.py, bwt_tool.py, bwt_tool_GUI.py, the bwt_script console entry point and
+#bwt_shell_MS/bwt_script.sh all import bwt(), bwt_inverse(), calculate_size() and measure_compression()
+#from here, so an engine or optimisation added to the package reaches all of them.
+#-----------------------------------------------------------------#
+
+from bwt_package.cache import cached
+from bwt_package.codec import compress_with_stats, decompress, throughput
+from bwt_package.dna import PackedDNA, is_nucleotide
+from bwt_package.instrumentation import instrumented
+from bwt_package.inverse import lf_inverse
+from bwt_package.lazy import lazy_import
+from bwt_package.rotation_matrix import InverseMatrix, RotationMatrix
+from bwt_package.run_length import count_runs
+from bwt_package.suffix_array import bwt_from_suffix_array, suffix_array
+
+#pandas is only imported when a DataFrame is built
+pd = lazy_import('pandas')
+
+
+#Define the custom implementation of Burrows-Wheeler Transform ()
+@instrumented('bwt')
+@cached('bwt')
+def bwt(string, engine='auto'):
+    """
+    This function takes a string as input and returns the Burrows-Wheeler Transform (BWT) of the string.
+    The BWT is obtained by cyclically permuting the string and sorting the permutations lexicographically;
+    the sorted order is taken from the suffix array of the string, so no rotation is compared as a whole.
+    The engine argument selects a suffix array engine of the registry by name ('naive', 'sort', 'sais', 'numpy'),
+    or 'auto' to let choose_engine() pick one from the length and content of the string and the free memory.
+    The function returns a RotationMatrix view containing the possible rotations and their sorted forms
+    (call to_frame() or page() on it for a Pandas DataFrame), and the BWT encoded string as its output.
+    """
+    string += '$'
+    # Sorting the rotations through the suffix array instead of comparing whole rotation strings
+    positions = suffix_array(string, engine)
+    bwt_encoded = bwt_from_suffix_array(string, positions)
+    # The matrix rows are only built when they are displayed
+    matrix = RotationMatrix(string, positions)
+    return matrix, bwt_encoded
+
+
+#Define the inverse BWT function
+@instrumented('bwt_inverse')
+@cached('bwt_inverse')
+def bwt_inverse(bwt_encoded):
+    """
+    This function takes a BWT encoded string as input and returns the original string before BWT was applied.
+    It reconstructs the original string by following the LF-mapping of the characters in the BWT encoded string
+    in a single linear-time pass.
+    The function returns an InverseMatrix view df containing the first column and the original sequence column
+    (call to_frame() on it for a Pandas DataFrame),
+    and the original string without the EOF character '$'.
+    """
+    if '$' not in bwt_encoded:
+        bwt_encoded += '$'
+    # Following the LF-mapping once through the BWT encoded string
+    string_original = lf_inverse(bwt_encoded)
+    # The first column is only built when the visualization is displayed
+    df = InverseMatrix(bwt_encoded)
+    return df, string_original
+
+
+#Function to calculate the size of a string in bytes
+def calculate_size(input_string):
+    """
+    This function calculates the size of a string in bytes.
+    Nucleotide sequences are measured by the footprint of their 2-bit packed representation (PackedDNA)
+    when it is smaller than their UTF-8 encoding, as for long sequences; any other string is encoded using
+    the UTF-8 encoding and the size of the encoding is returned.
+    """
+    if isinstance(input_string, PackedDNA):
+        return input_string.nbytes
+    size_in_bytes = len(input_string.encode('utf-8'))
+    if is_nucleotide(input_string):
+        # A short sequence full of N or IUPAC codes can take more room packed than as text
+        return min(PackedDNA(input_string).nbytes, size_in_bytes)
+    return size_in_bytes
+
+
+@instrumented('measure_compression')
+def measure_compression(input_sequence):
+    """
+    This function measures the compression rate of a given input sequence.
+    It compresses the input sequence with the BWT -> move-to-front -> run-length -> Huffman pipeline,
+    then decompresses the result to obtain the original sequence.
+    It calculates the original size, compressed size in bytes, compression ratio, compression rate (as a percentage),
+    the number of runs r of the BWT with the ratio r/n, and the throughput of every stage in MB/s,
+    and returns the measurements in a Pandas DataFrame.
+    """
+    original = input_sequence.encode('utf-8')
+    compressed, stage_times = compress_with_stats(original)
+    string_original = decompress(compressed).decode('utf-8')
+
+    original_size = len(original)
+    compressed_size = len(compressed)
+    compression_rate = compressed_size / original_size if original_size != 0 else 0
+    # Number of runs r in the BWT of the sequence, which a run-length BWT (RunLengthBWT) is proportional to
+    bwt_encoded = bwt(input_sequence)[1]
+    runs = count_runs(bwt_encoded)
+
+    result = pd.DataFrame({
+        'Sequence': [input_sequence],
+        'Original Sequence': [string_original],
+        'SequenceLength': [len(input_sequence)],
+        'OriginalBytes': [original_size],
+        'CompressedBytes': [compressed_size],
+        'CompressionRatio': [original_size / compressed_size],
+        'CompressionRate': [compression_rate * 100],  # Multiply by 100 to represent as percentage
+        'BWTRuns': [runs],
+        'RunsRatio': [runs / len(bwt_encoded)]  # r/n, the size of a run-length BWT relative to the plain BWT
+    })
+    # Throughput of every stage of the pipeline, in MB of input per second
+    for stage, seconds in stage_times.items():
+        result[f'{stage} MB/s'] = [throughput(original_size, seconds)]
+    return result
@@ -0,0 +1,227 @@
+# bwt_package/dna.py
+#-----------------------------------------------------------------#
+#2-bit packed nucleotide sequences
+#A, C, G and T are stored four to a byte, in either case: soft-masked (lowercase) stretches are packed as bases
+#and recorded as runs of a mask. Every other character (N, IUPAC codes, '$') is kept in a short list of runs of
+#exceptions, so long runs of N or of lowercase bases cost a few bytes.
+#-----------------------------------------------------------------#
+
+import re
+from bisect import bisect_right
+
+from bwt_package.lazy import lazy_import
+
+#NumPy is optional and only imported when an engine or method uses it
+np = lazy_import('numpy', optional=True)
+
+BASES = 'ACGT'
+IUPAC_CODES = set('ACGTUNRYSWKMBDHV-acgtunryswkmbdhv')
+#Each exception run is counted as its start and end positions (4 bytes each) and its character (1 byte)
+EXCEPTION_RUN_BYTES = 9
+#Each soft-mask run is counted as its start and end positions
+MASK_RUN_BYTES = 8
+_BASE_CODES = {base: code for code, base in enumerate(BASES)}
+_BASE_CODES.update({base.lower(): code for base, code in _BASE_CODES.items()})
+_ENCODE_TABLE = bytes(_BASE_CODES.get(chr(i), 0) for i in range(256))
+_DECODE_TABLE = [''.join(BASES[(byte >> shift) & 3] for shift in (0, 2, 4, 6)) for byte in range(256)]
+_EXCEPTION_RUN = re.compile(r'([^ACGTacgt])\1*')
+_MASK_RUN = re.compile(r'[acgt]+')
+
+
+def is_nucleotide(string):
+    """
+    This function returns True if the string only contains nucleotide characters (ACGT and IUPAC codes).
+    """
+    return bool(string) and set(string) <= IUPAC_CODES
+
+
+class PackedDNA:
+    """
+    This class stores a nucleotide sequence with 2 bits per base in a bytearray.
+    Lowercase a, c, g and t are packed like their uppercase bases, and the runs of them (start, end) are kept
+    as a soft mask; other characters are stored as runs of exceptions (start, end, character). Both are read back
+    on access. The object behaves like a read-only string for len(), indexing, slicing, iteration, count()
+    and index(), so bwt(), bwt_inverse() and FMIndex can use it in place of a str.
+    """
+
+    def __init__(self, string=''):
+        self.packed = bytearray()
+        self.length = 0
+        self.exception_starts = []
+        self.exception_ends = []
+        self.exception_chars = []
+        self.mask_starts = []
+        self.mask_ends = []
+        self.extend(string)
+
+    def extend(self, string):
+        """
+        This function appends the characters of string to the packed sequence.
+        """
+        string = str(string)
+        offset = self.length
+        # Exceptions are recorded as runs, merging with the last run when it continues it
+        for match in _EXCEPTION_RUN.finditer(string):
+            start, end, char = match.start() + offset, match.end() + offset, match.group(1)
+            if self.exception_ends and self.exception_ends[-1] == start and self.exception_chars[-1] == char:
+                self.exception_ends[-1] = end
+            else:
+                self.exception_starts.append(start)
+                self.exception_ends.append(end)
+                self.exception_chars.append(char)
+        for match in _MASK_RUN.finditer(string):
+            start, end = match.start() + offset, match.end() + offset
+            if self.mask_ends and self.mask_ends[-1] == start:
+                self.mask_ends[-1] = end
+            else:
+                self.mask_starts.append(start)
+                self.mask_ends.append(end)
+
+        if string.isascii():
+            codes = string.encode('ascii').translate(_ENCODE_TABLE)
+        else:
+            codes = bytes(_BASE_CODES.get(char, 0) for char in string)
+        # Fill the unused bits of the last byte first, then pack four bases per byte
+        position = 0
+        while self.length % 4 and position < len(codes):
+            self.packed[-1] |= codes[position] << (2 * (self.length % 4))
+            self.length += 1
+            position += 1
+        codes = codes[position:]
+        quarters = [codes[shift::4] for shift in range(4)]
+        for shift in range(1, 4):
+            quarters[shift] += bytes(len(quarters[0]) - len(quarters[shift]))
+        self.packed += bytes(a | (b << 2) | (c << 4) | (d << 6) for a, b, c, d in zip(*quarters))
+        self.length += len(codes)
+
+    def __len__(self):
+        return self.length
+
+    def __str__(self):
+        return self[0:self.length]
+
+    def __repr__(self):
+        return f"PackedDNA({str(self)!r})"
+
+    def __eq__(self, other):
+        if isinstance(other, PackedDNA):
+            return self.length == other.length and str(self) == str(other)
+        if isinstance(other, str):
+            return str(self) == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __add__(self, other):
+        result = PackedDNA()
+        result.packed = bytearray(self.packed)
+        result.length = self.length
+        result.exception_starts = list(self.exception_starts)
+        result.exception_ends = list(self.exception_ends)
+        result.exception_chars = list(self.exception_chars)
+        result.mask_starts = list(self.mask_starts)
+        result.mask_ends = list(self.mask_ends)
+        result.extend(other)
+        return result
+
+    def __iter__(self):
+        # Decoding in chunks keeps iteration fast without building the whole string
+        for start in range(0, self.length, 4096):
+            yield from self[start:start + 4096]
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(self.length)
+            if step != 1:
+                return self[start:stop][::step] if start < stop else ''
+            return self._decode(start, stop) if start < stop else ''
+        if item < 0:
+            item += self.length
+        if not 0 <= item < self.length:
+            raise IndexError("PackedDNA index out of range")
+        run = bisect_right(self.exception_starts, item) - 1
+        if run >= 0 and item < self.exception_ends[run]:
+            return self.exception_chars[run]
+        base = BASES[(self.packed[item >> 2] >> (2 * (item & 3))) & 3]
+        run = bisect_right(self.mask_starts, item) - 1
+        if run >= 0 and item < self.mask_ends[run]:
+            return base.lower()
+        return base
+
+    def _decode(self, start, stop):
+        first_byte = start >> 2
+        last_byte = (stop + 3) >> 2
+        decoded = ''.join([_DECODE_TABLE[byte] for byte in self.packed[first_byte:last_byte]])
+        decoded = decoded[start - 4 * first_byte:stop - 4 * first_byte]
+        # Overlay the soft-masked runs, then the exception runs, falling inside the slice
+        decoded = _overlay(decoded, start, stop, self.mask_starts, self.mask_ends,
+                           lambda run, bases: bases.lower())
+        return _overlay(decoded, start, stop, self.exception_starts, self.exception_ends,
+                        lambda run, bases: self.exception_chars[run] * len(bases))
+
+    def count(self, char, start=0, end=None):
+        """
+        This function returns the number of occurrences of char in the sequence between start and end, like str.count().
+        """
+        return self[start:end].count(char)
+
+    def index(self, char, start=0, end=None):
+        """
+        This function returns the first position of char in the sequence between start and end, like str.index().
+        """
+        start, end, _ = slice(start, end).indices(self.length)
+        for chunk_start in range(start, end, 4096):
+            position = self[chunk_start:min(chunk_start + 4096, end)].find(char)
+            if position != -1:
+                return chunk_start + position
+        raise ValueError("substring not found")
+
+    def __contains__(self, char):
+        try:
+            self.index(char)
+        except ValueError:
+            return False
+        return True
+
+    def character_codes(self):
+        """
+        This function returns the Unicode code point of every character, as a NumPy array when NumPy is installed
+        and a list otherwise, so suffix array engines can rank the sequence without decoding it to a str.
+        """
+        if np is not None:
+            packed = np.frombuffer(bytes(self.packed), dtype=np.uint8)
+            shifts = np.array([0, 2, 4, 6], dtype=np.uint8)
+            two_bit = ((packed[:, None] >> shifts) & 3).reshape(-1)[:self.length]
+            codes = np.array([ord(base) for base in BASES], dtype=np.uint32)[two_bit]
+            for start, end, char in zip(self.exception_starts, self.exception_ends, self.exception_chars):
+                codes[start:end] = ord(char)
+            for start, end in zip(self.mask_starts, self.mask_ends):
+                codes[start:end] += ord('a') - ord('A')
+            return codes
+        return [ord(char) for char in self]
+
+    @property
+    def nbytes(self):
+        """
+        The memory footprint of the packed representation in bytes: the packed bases plus the exception and mask runs.
+        """
+        return (len(self.packed) + EXCEPTION_RUN_BYTES * len(self.exception_starts)
+                + MASK_RUN_BYTES * len(self.mask_starts))
+
+
+def _overlay(decoded, start, stop, run_starts, run_ends, replace):
+    # Replaces the parts of decoded (the characters start to stop) covered by runs with replace(run, covered part)
+    run = max(bisect_right(run_starts, start) - 1, 0)
+    pieces = []
+    position = start
+    while run < len(run_starts) and run_starts[run] < stop:
+        run_start = max(run_starts[run], start)
+        run_end = min(run_ends[run], stop)
+        if run_end > run_start:
+            pieces.append(decoded[position - start:run_start - start])
+            pieces.append(replace(run, decoded[run_start - start:run_end - start]))
+            position = run_end
+        run += 1
+    pieces.append(decoded[position - start:])
+    return ''.join(pieces)
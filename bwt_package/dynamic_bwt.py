@@ -0,0 +1,301 @@
+# bwt_package/dynamic_bwt.py
+#-----------------------------------------------------------------#
+#Incremental BWT of a growing string
+#The BWT encoded string is kept in a dynamic sequence (blocks of characters with Fenwick trees of their
+#character counts), so a character can be inserted, deleted or ranked in O(log n). Text appended or prepended
+#to the string is inserted one character at a time with the four-stage update of Salson, Lecroq, Leonard and
+#Mouchard, and the result is always identical to running bwt() on the whole string again.
+#-----------------------------------------------------------------#
+
+from bisect import bisect_left
+
+from bwt_package.backward_search import BackwardSearch
+from bwt_package.suffix_array import bwt_from_suffix_array, suffix_array
+
+#Characters per block of the dynamic sequence; a block is split when it grows to twice this size
+DEFAULT_BLOCK_SIZE = 1024
+
+
+class _FenwickTree:
+    # Prefix sums of a list of integers with O(log n) updates (a binary indexed tree)
+
+    def __init__(self, values):
+        self.tree = [0] + list(values)
+        for i in range(1, len(self.tree)):
+            parent = i + (i & -i)
+            if parent < len(self.tree):
+                self.tree[parent] += self.tree[i]
+
+    def add(self, index, delta):
+        tree = self.tree
+        size = len(tree)
+        index += 1
+        while index < size:
+            tree[index] += delta
+            index += index & -index
+
+    def prefix_sum(self, index):
+        # Sum of the first index values
+        tree = self.tree
+        total = 0
+        while index > 0:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+    def search(self, target):
+        # Index of the value that contains position target of the running sum, and the sum of the values before it
+        tree = self.tree
+        size = len(tree)
+        index = 0
+        total = 0
+        step = 1 << (size - 1).bit_length()
+        while step:
+            following = index + step
+            if following < size and total + tree[following] <= target:
+                index = following
+                total += tree[following]
+            step >>= 1
+        return index, total
+
+
+class DynamicSequence:
+    """
+    This class is a string that supports insertion, deletion and rank in O(log n) time. The characters are
+    stored in blocks of up to 2 * block_size characters; a Fenwick tree over the block lengths finds the block
+    of a position, and one Fenwick tree per character over the block counts answers rank(), so only one block
+    is scanned (with str.count) per query.
+    """
+
+    def __init__(self, string='', block_size=DEFAULT_BLOCK_SIZE):
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        self.block_size = block_size
+        self.blocks = [string[start:start + block_size] for start in range(0, len(string), block_size)] or ['']
+        self.counts = {}
+        for char in string:
+            self.counts[char] = self.counts.get(char, 0) + 1
+        self.alphabet = sorted(self.counts)
+        self.length = len(string)
+        self._rebuild()
+
+    def _rebuild(self):
+        # Called whenever blocks are added or removed, which happens once every block_size updates at most
+        self.lengths = _FenwickTree(len(block) for block in self.blocks)
+        self.block_counts = [{char: block.count(char) for char in set(block)} for block in self.blocks]
+        self.ranks = {char: _FenwickTree(counts.get(char, 0) for counts in self.block_counts) for char in self.alphabet}
+
+    def __len__(self):
+        return self.length
+
+    def __str__(self):
+        return ''.join(self.blocks)
+
+    def _locate(self, position):
+        # Block holding position and the offset of position in it; the end of the string is the end of the last block
+        if position >= self.length:
+            return len(self.blocks) - 1, len(self.blocks[-1])
+        block, start = self.lengths.search(position)
+        return block, position - start
+
+    def __getitem__(self, position):
+        if not 0 <= position < self.length:
+            raise IndexError("DynamicSequence index out of range")
+        block, offset = self._locate(position)
+        return self.blocks[block][offset]
+
+    def rank(self, char, position):
+        """
+        This function returns the number of occurrences of char in the first position characters.
+        """
+        ranks = self.ranks.get(char)
+        if ranks is None:
+            return 0
+        block, offset = self._locate(position)
+        return ranks.prefix_sum(block) + self.blocks[block].count(char, 0, offset)
+
+    def smaller(self, char):
+        """
+        This function returns the number of characters smaller than char, i.e. the C-table entry of char.
+        """
+        return sum(self.counts[other] for other in self.alphabet[:bisect_left(self.alphabet, char)])
+
+    def _count(self, block, char, delta):
+        counts = self.block_counts[block]
+        counts[char] = counts.get(char, 0) + delta
+        self.counts[char] = self.counts.get(char, 0) + delta
+        if char not in self.ranks:
+            self.alphabet.insert(bisect_left(self.alphabet, char), char)
+            self.ranks[char] = _FenwickTree(0 for _ in self.blocks)
+        self.ranks[char].add(block, delta)
+
+    def insert(self, position, char):
+        """
+        This function inserts char before position (at the end when position is the length of the string).
+        """
+        block, offset = self._locate(position)
+        text = self.blocks[block]
+        self.blocks[block] = text[:offset] + char + text[offset:]
+        self.lengths.add(block, 1)
+        self.length += 1
+        self._count(block, char, 1)
+        if len(self.blocks[block]) >= 2 * self.block_size:
+            text = self.blocks[block]
+            self.blocks[block:block + 1] = [text[:self.block_size], text[self.block_size:]]
+            self._rebuild()
+
+    def delete(self, position):
+        """
+        This function removes the character at position and returns it.
+        """
+        block, offset = self._locate(position)
+        text = self.blocks[block]
+        char = text[offset]
+        self.blocks[block] = text[:offset] + text[offset + 1:]
+        self.lengths.add(block, -1)
+        self.length -= 1
+        self._count(block, char, -1)
+        if not self.blocks[block] and len(self.blocks) > 1:
+            del self.blocks[block]
+            self._rebuild()
+        return char
+
+    def replace(self, position, char):
+        """
+        This function replaces the character at position by char and returns the character it replaced.
+        """
+        block, offset = self._locate(position)
+        text = self.blocks[block]
+        old = text[offset]
+        self.blocks[block] = text[:offset] + char + text[offset + 1:]
+        self._count(block, old, -1)
+        self._count(block, char, 1)
+        return old
+
+
+class DynamicBWT(BackwardSearch):
+    """
+    This class holds the BWT encoded string of a string that grows at either end. append() and prepend() update
+    the BWT and its rank structure (a DynamicSequence) in place instead of transforming the whole string again:
+    - prepending a character replaces the '$' of the BWT and inserts a new '$' row, in O(log n);
+    - appending a character changes every suffix, so the rows whose order changes are moved one by one
+      after the insertion, walking the LF-mapping back from the end of the string. The number of rows moved
+      is usually close to the length of the longest repeat ending there, but can reach n for a highly
+      repetitive string such as ATATAT...
+    bwt_encoded is always equal to the BWT encoded string returned by bwt() for the current string.
+    As in the FM-index, count() finds a pattern by backward search.
+    """
+
+    def __init__(self, string='', engine='auto', block_size=DEFAULT_BLOCK_SIZE):
+        _check_text(string)
+        string += '$'
+        bwt_encoded = bwt_from_suffix_array(string, suffix_array(string, engine)) if len(string) > 1 else '$'
+        self.sequence = DynamicSequence(bwt_encoded, block_size)
+        # Row of the whole string, the only row whose BWT character is '$'
+        self.dollar_row = bwt_encoded.index('$')
+
+    @property
+    def bwt_encoded(self):
+        """
+        The BWT encoded string of the current string, including its '$'.
+        """
+        return str(self.sequence)
+
+    def __len__(self):
+        return len(self.sequence)
+
+    def append(self, text):
+        """
+        This function appends text to the end of the string and updates the BWT.
+        """
+        _check_text(text)
+        for char in text:
+            # The new character goes before the terminator, i.e. in front of the suffix '$'
+            self._insert_before(self.sequence.smaller('$'), char)
+
+    def prepend(self, text):
+        """
+        This function adds text to the start of the string and updates the BWT.
+        """
+        _check_text(text)
+        for char in reversed(text):
+            # The new character goes in front of the whole string, whose row is the row ending in '$'
+            self._insert_before(self.dollar_row, char)
+
+    def _insert_before(self, row, char):
+        # Inserts char in the string in front of the suffix sorted at row
+        sequence = self.sequence
+        previous = sequence[row]
+        # Row of the suffix starting with the character before the insertion point, before the update
+        moved = sequence.smaller(previous) + sequence.rank(previous, row)
+
+        # Stage 1: the suffix at row is now preceded by char
+        smaller = sequence.smaller(char)
+        sequence.replace(row, char)
+        # Stage 2: the new suffix starting with char is inserted at its sorted position
+        inserted = smaller + sequence.rank(char, row)
+        self._insert_row(inserted, previous)
+        if moved >= inserted:
+            moved += 1
+
+        # Stage 3: the suffixes before the insertion point are moved to their new sorted position,
+        # walking the LF-mapping back until one of them is already in place
+        expected = sequence.smaller(previous) + sequence.rank(previous, inserted)
+        # Row and character of the LF source of the row being moved, which has already reached its new position
+        source, source_char = inserted, previous
+        while moved != expected:
+            current = sequence[moved]
+            following = sequence.smaller(current) + sequence.rank(current, moved)
+            if source_char == current:
+                # The row being moved is still at its old position, but its source is already at the new one,
+                # so the rank counts it on the wrong side; it is above the next row only if it sits above it
+                if source < moved:
+                    following -= 1
+                if moved <= following:
+                    following += 1
+            self._delete_row(moved)
+            self._insert_row(expected, current)
+            if following > moved:
+                following -= 1
+            if following >= expected:
+                following += 1
+            source, source_char = expected, current
+            moved, expected = following, sequence.smaller(current) + sequence.rank(current, expected)
+
+    def _insert_row(self, row, char):
+        self.sequence.insert(row, char)
+        if char == '$':
+            self.dollar_row = row
+        elif row <= self.dollar_row:
+            self.dollar_row += 1
+
+    def _delete_row(self, row):
+        self.sequence.delete(row)
+        if row < self.dollar_row:
+            self.dollar_row -= 1
+
+    def access(self, row):
+        """
+        This function returns the character of the dynamic sequence at row.
+        """
+        return self.sequence[row]
+
+    def occ(self, char, position):
+        """
+        This function returns the number of occurrences of char in the first position characters of the BWT.
+        """
+        return self.sequence.rank(char, position)
+
+    def first_row(self, char):
+        """
+        This function returns the number of characters of the BWT smaller than char, or None if char is not in the BWT.
+        """
+        if char not in self.sequence.ranks:
+            return None
+        return self.sequence.smaller(char)
+
+
+def _check_text(text):
+    # The update relies on '$' occurring once, as the terminator
+    if '$' in text:
+        raise ValueError("Text added to a DynamicBWT cannot contain the EOF character '$'")
@@ -0,0 +1,92 @@
+# bwt_package/fastx.py
+#-----------------------------------------------------------------#
+#Streaming FASTA/FASTQ input and FASTA/JSONL output
+#Records are read one at a time through generators, so files with millions of reads are
+#never loaded into memory. Gzip-compressed input is detected from its magic number.
+#-----------------------------------------------------------------#
+
+import gzip
+import io
+import json
+import sys
+
+GZIP_MAGIC = b'\x1f\x8b'
+OUTPUT_FORMATS = ['fasta', 'jsonl']
+
+
+def open_text(path):
+    """
+    This function opens a plain or gzip-compressed file for reading as text ('-' reads standard input).
+    """
+    if path == '-':
+        return sys.stdin
+    handle = open(path, 'rb')
+    if handle.peek(2)[:2] == GZIP_MAGIC:
+        return io.TextIOWrapper(gzip.GzipFile(fileobj=handle), encoding='utf-8')
+    return io.TextIOWrapper(handle, encoding='utf-8')
+
+
+def read_fastx(handle):
+    """
+    This function takes a text file object in FASTA or FASTQ format and yields (record_id, sequence) tuples.
+    The format is detected from the first character of the file ('>' for FASTA, '@' for FASTQ).
+    FASTA sequences may span several lines; FASTQ records are read four lines at a time and the qualities are skipped.
+    """
+    first = handle.read(1)
+    if not first:
+        return
+    if first == '>':
+        yield from _read_fasta(handle)
+    elif first == '@':
+        yield from _read_fastq(handle)
+    else:
+        raise ValueError("Input is neither FASTA ('>') nor FASTQ ('@')")
+
+
+def _read_fasta(handle):
+    # The leading '>' of the first header has already been consumed
+    header = handle.readline()
+    while header:
+        record_id = header[:-1].split(None, 1)[0] if header.strip() else ''
+        lines = []
+        for line in handle:
+            if line.startswith('>'):
+                yield record_id, ''.join(lines)
+                header = line[1:]
+                break
+            lines.append(line.strip())
+        else:
+            yield record_id, ''.join(lines)
+            return
+
+
+def _read_fastq(handle):
+    # The leading '@' of the first header has already been consumed
+    header = handle.readline()
+    while header:
+        sequence = handle.readline().strip()
+        handle.readline()
+        handle.readline()
+        yield header.split(None, 1)[0] if header.strip() else '', sequence
+        header = handle.readline()
+        if header and not header.startswith('@'):
+            raise ValueError(f"Malformed FASTQ record header: {header.strip()!r}")
+        header = header[1:]
+
+
+def write_record(handle, record_id, sequence, output_format='fasta', line_width=None):
+    """
+    This function writes one record to a text file object as FASTA (optionally wrapped to line_width characters)
+    or as one JSON object per line.
+    """
+    if output_format == 'jsonl':
+        handle.write(json.dumps({'id': record_id, 'sequence': sequence}) + '\n')
+    elif output_format == 'fasta':
+        handle.write(f">{record_id}\n")
+        if line_width:
+            for start in range(0, len(sequence), line_width):
+                handle.write(sequence[start:start + line_width] + '\n')
+        else:
+            handle.write(sequence + '\n')
+    else:
+        raise ValueError(f"Unknown output format '{output_format}', expected one of: {', '.join(OUTPUT_FORMATS)}")
@@ -0,0 +1,198 @@
+# bwt_package/fm_index.py
+#-----------------------------------------------------------------#
+#FM-index over the output of bwt()
+#Pattern counting by backward search, using the C-table and occurrence counts sampled
+#every k positions of the BWT encoded string, and pattern location from a suffix array sampled
+#every s text positions. For large alphabets, the Occ table can be replaced by a wavelet matrix whose size
+#does not grow with the alphabet. An index can be saved to a binary file and mapped back without rebuilding it.
+#-----------------------------------------------------------------#
+
+from array import array
+
+from bwt_package.backward_search import BackwardSearch
+from bwt_package.dna import PackedDNA
+from bwt_package.index_file import close_index, map_index, write_index
+from bwt_package.inverse import first_occurrences
+from bwt_package.suffix_array import bwt_from_suffix_array, suffix_array
+from bwt_package.wavelet import WaveletMatrix
+
+DEFAULT_OCC_SAMPLE_RATE = 32
+DEFAULT_SA_SAMPLE_RATE = 32
+#Structures answering occ(): the sampled Occ table, or a wavelet matrix over the BWT
+RANK_BACKENDS = ['checkpoints', 'wavelet']
+
+
+class FMIndex(BackwardSearch):
+    """
+    This class is an FM-index built from a BWT encoded string (including its '$'), either a str or a PackedDNA.
+    The C-table gives the first row of every character in the sorted first column, and the Occ table
+    stores, every occ_sample_rate positions, how many times each character occurred before that position.
+    A larger sample rate uses less memory; a smaller one answers occ() with a shorter scan.
+    For locate(), the suffix array is only kept for the rows whose text position is a multiple of
+    sa_sample_rate; other rows are walked back with the LF-mapping until a sampled row is reached.
+    If the suffix array positions are not passed in, the samples are recovered by sample_by_lf_walk().
+    The Occ table holds one counter per character at every checkpoint, which is fine for DNA but grows with
+    protein or byte alphabets: rank_backend='wavelet' answers occ() from a WaveletMatrix instead, in
+    O(log sigma) bitvector ranks and about 1.2 log2(sigma) bits per character whatever the sample rate.
+    """
+
+    def __init__(self, bwt_encoded, occ_sample_rate=DEFAULT_OCC_SAMPLE_RATE, sa_sample_rate=DEFAULT_SA_SAMPLE_RATE,
+                 positions=None, rank_backend='checkpoints'):
+        if occ_sample_rate < 1:
+            raise ValueError("occ_sample_rate must be at least 1")
+        if sa_sample_rate < 1:
+            raise ValueError("sa_sample_rate must be at least 1")
+        if rank_backend not in RANK_BACKENDS:
+            raise ValueError(f"Unknown rank backend '{rank_backend}', choose among {', '.join(RANK_BACKENDS)}")
+        self.bwt_encoded = bwt_encoded
+        self.occ_sample_rate = occ_sample_rate
+        self.sa_sample_rate = sa_sample_rate
+        self.rank_backend = rank_backend
+        # Fields of the mapped index file, for an index returned by load()
+        self._mapped = None
+        self.c_table = first_occurrences(bwt_encoded)
+        if rank_backend == 'wavelet':
+            self.wavelet = WaveletMatrix(bwt_encoded)
+            self.checkpoints = None
+        else:
+            self.wavelet = None
+            self.checkpoints = self._build_checkpoints()
+        self.sa_samples = self._sample_suffix_array(positions)
+
+    @classmethod
+    def from_string(cls, string, engine='auto', occ_sample_rate=DEFAULT_OCC_SAMPLE_RATE,
+                    sa_sample_rate=DEFAULT_SA_SAMPLE_RATE, rank_backend='checkpoints'):
+        """
+        This function builds the FM-index of a string with the same suffix array engine used by bwt(),
+        sampling the suffix array it has just built.
+        """
+        string += '$'
+        positions = suffix_array(string, engine)
+        bwt_encoded = bwt_from_suffix_array(string, positions)
+        if isinstance(string, PackedDNA):
+            # Keeping the BWT of a packed sequence packed as well
+            bwt_encoded = PackedDNA(bwt_encoded)
+        return cls(bwt_encoded, occ_sample_rate, sa_sample_rate, positions, rank_backend)
+
+    @classmethod
+    def load(cls, path):
+        """
+        This function maps an index file written by save() and returns the FM-index without rebuilding it.
+        The BWT, Occ checkpoints and suffix array samples stay in the mapped file and are read on demand,
+        so loading takes the same time whatever the size of the index and processes share the same pages.
+        The mapping stays open until close() is called, or the end of a with block using the index.
+        """
+        fields = map_index(path)
+        index = cls.__new__(cls)
+        index._mapped = fields
+        index.bwt_encoded = fields['bwt_encoded']
+        index.occ_sample_rate = fields['occ_sample_rate']
+        index.sa_sample_rate = fields['sa_sample_rate']
+        index.c_table = fields['c_table']
+        index.rank_backend = 'checkpoints'
+        index.wavelet = None
+        index.checkpoints = fields['checkpoints']
+        index.sa_samples = fields['sa_samples']
+        return index
+
+    def save(self, path):
+        """
+        This function writes the index (BWT, C-table, Occ checkpoints and suffix array samples) to a binary file.
+        The file format stores the Occ checkpoints, so they are built first for an index using the wavelet backend.
+        """
+        if self.checkpoints is None:
+            self.checkpoints = self._build_checkpoints()
+        write_index(path, self)
+
+    def close(self):
+        """
+        This function unmaps the file of an index returned by load(), which cannot be queried afterwards.
+        It does nothing for an index built in memory.
+        """
+        if self._mapped is not None:
+            close_index(self._mapped)
+            self._mapped = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self.bwt_encoded)
+
+    def _build_checkpoints(self):
+        # checkpoints[char][j] is the number of occurrences of char in bwt_encoded[:j * occ_sample_rate]
+        k = self.occ_sample_rate
+        checkpoints = {}
+        for char in self.c_table:
+            counts = array('i', [0])
+            total = 0
+            for start in range(0, len(self.bwt_encoded), k):
+                total += self.bwt_encoded.count(char, start, start + k)
+                counts.append(total)
+            checkpoints[char] = counts
+        return checkpoints
+
+    def _sample_suffix_array(self, positions):
+        # sa_samples maps a row of the BWT matrix to the text position of its rotation
+        s = self.sa_sample_rate
+        if positions is not None:
+            return {row: position for row, position in enumerate(positions) if position % s == 0}
+        if '$' not in self.bwt_encoded:
+            return {}
+        return self.sample_by_lf_walk(self.bwt_encoded.index('$'), lambda row, position: position % s == 0)
+
+    def access(self, row):
+        """
+        This function returns the character at row of the stored BWT encoded string (str, PackedDNA or mapped bytes).
+        """
+        return self.bwt_encoded[row]
+
+    def first_row(self, char):
+        """
+        This function returns the C-table entry of char, or None if char is not in the BWT.
+        """
+        return self.c_table.get(char)
+
+    def occ(self, char, position):
+        """
+        This function returns the number of occurrences of char in the first position characters of the BWT.
+        """
+        if self.wavelet is not None:
+            return self.wavelet.rank(char, position)
+        counts = self.checkpoints.get(char)
+        if counts is None:
+            return 0
+        checkpoint = position // self.occ_sample_rate
+        start = checkpoint * self.occ_sample_rate
+        return counts[checkpoint] + self.bwt_encoded.count(char, start, position)
+
+    def locate(self, pattern):
+        """
+        This function returns the sorted list of positions at which pattern occurs in the indexed string.
+        Each matching row is walked back with the LF-mapping until a sampled row is found, so a query costs
+        at most sa_sample_rate LF steps per occurrence.
+        """
+        top, bottom = self.backward_search(pattern)
+        located = []
+        for row in range(top, bottom):
+            steps = 0
+            while row not in self.sa_samples:
+                row = self.lf(row)
+                steps += 1
+            located.append(self.sa_samples[row] + steps)
+        return sorted(located)
+
+    def memory_size(self):
+        """
+        This function returns the size in bytes of the rank structure (Occ checkpoints or wavelet matrix) and of
+        the suffix array samples, the parts of the index tuned by the sample rates and the rank backend
+        (the samples are counted as two 4-byte integers each).
+        """
+        if self.wavelet is not None:
+            occ_size = self.wavelet.memory_size()
+        else:
+            occ_size = sum(counts.itemsize * len(counts) for counts in self.checkpoints.values())
+        return occ_size + 8 * len(self.sa_samples)
@@ -0,0 +1,84 @@
+# bwt_package/import_benchmark.py
+#-----------------------------------------------------------------#
+#Cold-start benchmark of the entry points
+#Every case is run in a fresh interpreter, so the times include all module imports.
+#Run with: python -m bwt_package.import_benchmark --repeat 10
+#-----------------------------------------------------------------#
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+#Repository root, from which the scripts are started
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ['pandas', 'numpy', 'matplotlib']
+
+#Label and interpreter arguments of every case; the reference cases show what the lazy imports save
+CASES = [
+    ('Empty interpreter', ['-c', 'pass']),
+    ('Core library', ['-c', 'import bwt_package.suffix_array, bwt_package.inverse, bwt_package.rotation_matrix, '
+                            'bwt_package.codec, bwt_package.dna, bwt_package.fm_index']),
+    ('bwt_tool.py (GUI module)', ['-c', 'import bwt_tool']),
+    ('bwt_script console entry point', ['-c', 'import bwt_package.bwt_script']),
+    ('bwt_script.sh --option 3', [os.path.join('bwt_shell_MS', 'bwt_script.sh'), '--option', '3',
+                                  '--string_size', 'GATTACA']),
+    ('Reference: import pandas', ['-c', 'import pandas']),
+]
+
+
+def time_command(arguments, repeat=5):
+    """
+    This function starts a fresh Python interpreter with arguments repeat times from the repository root
+    and returns the wall-clock times in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + arguments, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def heavy_modules_loaded(statement):
+    """
+    This function runs statement in a fresh interpreter and returns the HEAVY_MODULES it left imported.
+    """
+    check = f"{statement}\nimport sys\nprint(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    output = subprocess.run([sys.executable, '-c', check], cwd=ROOT, capture_output=True, text=True, check=True)
+    return output.stdout.split()
+
+
+def run_benchmark(repeat=5):
+    """
+    This function times every case in CASES and returns one dictionary per case with its min and median
+    start-up time in seconds and, for import statements, the heavy modules loaded.
+    """
+    results = []
+    for label, arguments in CASES:
+        timings = time_command(arguments, repeat)
+        statement = arguments[1] if arguments[0] == '-c' else None
+        results.append({
+            'Case': label,
+            'Min': min(timings),
+            'Median': statistics.median(timings),
+            'HeavyModules': heavy_modules_loaded(statement) if statement else None,
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure the cold-start time of the BWT entry points')
+    parser.add_argument('--repeat', type=int, default=5, help='Fresh interpreters started per case')
+    args = parser.parse_args(argv)
+
+    print(f"{'Case':<34} {'Min (ms)':>9} {'Median (ms)':>12}  Heavy modules imported")
+    for row in run_benchmark(args.repeat):
+        heavy = '-' if row['HeavyModules'] is None else (', '.join(row['HeavyModules']) or 'none')
+        print(f"{row['Case']:<34} {row['Min'] * 1000:>9.1f} {row['Median'] * 1000:>12.1f}  {heavy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+# bwt_package/index_file.py
+#-----------------------------------------------------------------#
+#Versioned binary file format for the FM-index
+#A fixed header is followed by 8-byte aligned arrays (alphabet, C-table, BWT, Occ checkpoints,
+#suffix array samples). Loading maps the file and views the arrays in place, without parsing them,
+#so an index of any size loads in constant time and is shared through the page cache.
+#-----------------------------------------------------------------#
+
+import mmap
+import struct
+import sys
+from bisect import bisect_left
+
+MAGIC = b'BWTI'
+VERSION = 1
+#Header: version, flags, BWT length, Occ and SA sample rates, alphabet size, number of SA samples,
+#then the byte offsets of the alphabet, C-table, BWT, checkpoint, sampled row and sampled position arrays
+_HEADER = struct.Struct('<HHQIIII6Q')
+HEADER_SIZE = len(MAGIC) + _HEADER.size
+ALIGNMENT = 8
+#Every array is stored little-endian as 4-byte integers, apart from the BWT (one alphabet rank per byte)
+_INT_CODE = 'i'
+_INT_SIZE = 4
+
+
+class MappedBWT:
+    """
+    This class is a read-only view of a BWT encoded string stored as one alphabet rank per byte.
+    It supports what FMIndex needs from a str (len(), indexing, slicing, count(), index() and 'in')
+    while the bytes stay in the mapped file.
+    """
+
+    def __init__(self, ranks, alphabet):
+        self.ranks = ranks
+        self.alphabet = alphabet
+        self.codes = {char: rank for rank, char in enumerate(alphabet)}
+
+    def __len__(self):
+        return len(self.ranks)
+
+    def __str__(self):
+        return self[0:len(self)]
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return ''.join([self.alphabet[rank] for rank in self.ranks[item]])
+        return self.alphabet[self.ranks[item]]
+
+    def count(self, char, start=0, end=None):
+        """
+        This function returns the number of occurrences of char between start and end, like str.count().
+        """
+        code = self.codes.get(char)
+        if code is None:
+            return 0
+        return bytes(self.ranks[start:end]).count(code)
+
+    def index(self, char, start=0, end=None):
+        """
+        This function returns the first position of char between start and end, like str.index().
+        """
+        code = self.codes.get(char)
+        start, end, _ = slice(start, end).indices(len(self))
+        if code is not None:
+            for chunk_start in range(start, end, 4096):
+                position = bytes(self.ranks[chunk_start:min(chunk_start + 4096, end)]).find(code)
+                if position != -1:
+                    return chunk_start + position
+        raise ValueError("substring not found")
+
+    def __contains__(self, char):
+        try:
+            self.index(char)
+        except ValueError:
+            return False
+        return True
+
+
+class SampleTable:
+    """
+    This class maps the sampled rows of the suffix array to their text positions, like the dictionary FMIndex
+    builds in memory, by binary search over the sorted rows stored in the file.
+    """
+
+    def __init__(self, rows, positions):
+        self.rows = rows
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _find(self, row):
+        i = bisect_left(self.rows, row)
+        return i if i < len(self.rows) and self.rows[i] == row else -1
+
+    def __contains__(self, row):
+        return self._find(row) != -1
+
+    def __getitem__(self, row):
+        i = self._find(row)
+        if i == -1:
+            raise KeyError(row)
+        return self.positions[i]
+
+    def __iter__(self):
+        # The sampled rows, in sorted order like the file stores them
+        return iter(self.rows)
+
+    def items(self):
+        """
+        This function returns the (row, text position) pairs of the samples, like dict.items().
+        """
+        return zip(self.rows, self.positions)
+
+
+def _padding(size):
+    return -size % ALIGNMENT
+
+
+def write_index(path, index):
+    """
+    This function writes the arrays of an FMIndex to path in the binary index format.
+    """
+    alphabet = sorted(index.c_table)
+    if len(alphabet) > 256:
+        raise ValueError("The binary index format supports at most 256 distinct characters")
+    codes = {char: rank for rank, char in enumerate(alphabet)}
+    bwt_encoded = str(index.bwt_encoded)
+    samples = sorted(index.sa_samples.items())
+    sampled_rows = [row for row, _ in samples]
+
+    sections = [
+        struct.pack(f'<{len(alphabet)}I', *(ord(char) for char in alphabet)),
+        struct.pack(f'<{len(alphabet)}i', *(index.c_table[char] for char in alphabet)),
+        bytes(codes[char] for char in bwt_encoded),
+        b''.join(struct.pack(f'<{len(index.checkpoints[char])}i', *index.checkpoints[char]) for char in alphabet),
+        struct.pack(f'<{len(sampled_rows)}i', *sampled_rows),
+        struct.pack(f'<{len(sampled_rows)}i', *(position for _, position in samples)),
+    ]
+    offsets = []
+    offset = HEADER_SIZE + _padding(HEADER_SIZE)
+    for section in sections:
+        offsets.append(offset)
+        offset += len(section) + _padding(len(section))
+
+    with open(path, 'wb') as handle:
+        handle.write(MAGIC)
+        handle.write(_HEADER.pack(VERSION, 0, len(bwt_encoded), index.occ_sample_rate, index.sa_sample_rate,
+                                  len(alphabet), len(sampled_rows), *offsets))
+        handle.write(bytes(_padding(HEADER_SIZE)))
+        for section in sections:
+            handle.write(section)
+            handle.write(bytes(_padding(len(section))))
+
+
+def map_index(path):
+    """
+    This function maps an index file written by write_index() and returns a dictionary of its fields:
+    the sample rates, the C-table, and views of the BWT, Occ checkpoints and suffix array samples into the mapping.
+    Only the header, the alphabet and the C-table are read; the arrays are paged in on access.
+    The mapping and every view into it are returned as well, so that close_index() can release them.
+    """
+    if sys.byteorder != 'little':
+        raise ValueError("Index files can only be mapped on little-endian machines")
+    with open(path, 'rb') as handle:
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mapped) < HEADER_SIZE or mapped[:len(MAGIC)] != MAGIC:
+        mapped.close()
+        raise ValueError("Input is not a BWT index file (bad magic number)")
+    (version, _, n, occ_sample_rate, sa_sample_rate, sigma, sample_count,
+     alphabet_offset, c_table_offset, bwt_offset, checkpoint_offset, rows_offset, positions_offset) = \
+        _HEADER.unpack_from(mapped, len(MAGIC))
+    if version != VERSION:
+        mapped.close()
+        raise ValueError(f"Unsupported index file version {version}, expected {VERSION}")
+    checkpoint_count = (n + occ_sample_rate - 1) // occ_sample_rate + 1
+    if positions_offset + sample_count * _INT_SIZE > len(mapped):
+        mapped.close()
+        raise ValueError("Truncated BWT index file")
+
+    view = memoryview(mapped)
+    views = [view]
+
+    def int_array(offset, count):
+        with view[offset:offset + count * _INT_SIZE] as section:
+            views.append(section.cast(_INT_CODE))
+        return views[-1]
+
+    alphabet = [chr(code) for code in struct.unpack_from(f'<{sigma}I', mapped, alphabet_offset)]
+    c_values = struct.unpack_from(f'<{sigma}i', mapped, c_table_offset)
+    checkpoints = {char: int_array(checkpoint_offset + rank * checkpoint_count * _INT_SIZE, checkpoint_count)
+                   for rank, char in enumerate(alphabet)}
+    bwt_view = view[bwt_offset:bwt_offset + n]
+    views.append(bwt_view)
+    sa_samples = SampleTable(int_array(rows_offset, sample_count), int_array(positions_offset, sample_count))
+    return {
+        'mapped': mapped,
+        'views': views,
+        'occ_sample_rate': occ_sample_rate,
+        'sa_sample_rate': sa_sample_rate,
+        'c_table': dict(zip(alphabet, c_values)),
+        'bwt_encoded': MappedBWT(bwt_view, alphabet),
+        'checkpoints': checkpoints,
+        'sa_samples': sa_samples,
+    }
+
+
+def close_index(fields):
+    """
+    This function releases the views returned by map_index() and closes the mapping (and with it the file).
+    The arrays of the index cannot be used afterwards.
+    """
+    for view in reversed(fields['views']):
+        view.release()
+    fields['views'].clear()
+    fields['mapped'].close()
@@ -0,0 +1,178 @@
+# bwt_package/instrumentation.py
+#-----------------------------------------------------------------#
+#Opt-in timing and memory instrumentation of the phases of bwt(), bwt_inverse() and measure_compression()
+#Phases report to the registered callbacks; with no callback registered, phase() returns a shared
+#do-nothing context manager, so the instrumented code only pays for one empty-list check.
+#-----------------------------------------------------------------#
+
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+#Functions called with a dictionary describing every phase that finishes
+_callbacks = []
+_NULL_PHASE = contextlib.nullcontext()
+_state = threading.local()
+
+
+def add_callback(callback):
+    """
+    This function registers callback to be called with a dictionary for every finished phase:
+    name, start_ns, duration_ns, depth (nesting level), thread id and peak_bytes (None unless memory is traced).
+    """
+    _callbacks.append(callback)
+
+
+def remove_callback(callback):
+    """
+    This function unregisters a callback added with add_callback().
+    """
+    _callbacks.remove(callback)
+
+
+def phase(name):
+    """
+    This function returns a context manager timing the code it wraps as the phase name.
+    When nothing is registered, it returns a shared no-op context manager.
+    """
+    if not _callbacks:
+        return _NULL_PHASE
+    return _Phase(name)
+
+
+def instrumented(name):
+    """
+    This function is a decorator timing every call of the decorated function as the phase name.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _callbacks:
+                return function(*args, **kwargs)
+            with _Phase(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class _Phase:
+    # One entry of the per-thread stack of open phases
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        stack = getattr(_state, 'stack', None)
+        if stack is None:
+            stack = _state.stack = []
+        self.tracing = tracemalloc.is_tracing()
+        if self.tracing:
+            # The peak is reset for this phase, so the enclosing phase keeps the peak reached so far
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+            self.start_memory = current
+            self.peak = current
+        stack.append(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end_ns = time.perf_counter_ns()
+        stack = _state.stack
+        stack.pop()
+        peak_bytes = None
+        if self.tracing and tracemalloc.is_tracing():
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            peak_bytes = self.peak - self.start_memory
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, self.peak)
+        event = {
+            'name': self.name,
+            'start_ns': self.start_ns,
+            'duration_ns': end_ns - self.start_ns,
+            'depth': len(stack),
+            'thread': threading.get_ident(),
+            'peak_bytes': peak_bytes,
+        }
+        for callback in list(_callbacks):
+            callback(event)
+        return False
+
+
+class Recorder:
+    """
+    This class collects the phases run inside a with block:
+
+        with Recorder(memory=True) as recorder:
+            bwt("GATTACA")
+        print(recorder.to_dict())
+
+    With memory=True, tracemalloc is started for the duration of the block (unless it is already running) and the
+    peak memory allocated by every phase, above what was allocated when it started, is recorded as well.
+    """
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.events = []
+        self._started_tracemalloc = False
+
+    def __enter__(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        add_callback(self.events.append)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        remove_callback(self.events.append)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        return False
+
+    def to_dict(self):
+        """
+        This function returns the recorded phases aggregated by name: the number of calls, the total time
+        in seconds and the largest peak memory in bytes (None when memory was not traced).
+        """
+        summary = {}
+        for event in self.events:
+            entry = summary.setdefault(event['name'], {'calls': 0, 'seconds': 0.0, 'peak_bytes': None})
+            entry['calls'] += 1
+            entry['seconds'] += event['duration_ns'] / 1e9
+            if event['peak_bytes'] is not None:
+                entry['peak_bytes'] = max(entry['peak_bytes'] or 0, event['peak_bytes'])
+        return summary
+
+    def to_chrome_trace(self):
+        """
+        This function returns the recorded phases in the Chrome trace event format, which can be opened in
+        chrome://tracing or Perfetto. Times are in microseconds.
+        """
+        events = []
+        for event in sorted(self.events, key=lambda event: event['start_ns']):
+            trace_event = {
+                'name': event['name'],
+                'ph': 'X',
+                'ts': event['start_ns'] / 1000,
+                'dur': event['duration_ns'] / 1000,
+                'pid': os.getpid(),
+                'tid': event['thread'],
+            }
+            if event['peak_bytes'] is not None:
+                trace_event['args'] = {'peak_bytes': event['peak_bytes']}
+            events.append(trace_event)
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def save_chrome_trace(self, path):
+        """
+        This function writes the recorded phases to path as a Chrome trace JSON file.
+        """
+        with open(path, 'w') as handle:
+            json.dump(self.to_chrome_trace(), handle)
@@ -0,0 +1,63 @@
+# bwt_package/inverse.py
+#-----------------------------------------------------------------#
+#Linear-time inverse Burrows-Wheeler Transform
+#The original string is rebuilt in a single pass over the LF-mapping, using a counting sort
+#instead of a comparison sort and an array-backed next-pointer table.
+#-----------------------------------------------------------------#
+
+from array import array
+from collections import Counter
+
+from bwt_package.instrumentation import instrumented
+
+#Largest row number a 32-bit row table can hold
+_MAX_INT32 = 2 ** 31 - 1
+
+
+def first_occurrences(bwt_encoded):
+    """
+    This function returns the C-array of a BWT encoded string as a dictionary: for every character, the row
+    at which it first appears in the sorted first column of the BWT matrix.
+    """
+    counts = Counter(bwt_encoded)
+    first = {}
+    total = 0
+    for char in sorted(counts):
+        first[char] = total
+        total += counts[char]
+    return first
+
+
+def row_array(n):
+    """
+    This function returns a zero-filled array of n row numbers, using 4-byte integers while every row fits
+    and 8-byte integers for inputs of 2**31 characters or more.
+    """
+    typecode = 'i' if n <= _MAX_INT32 else 'q'
+    return array(typecode, bytes(n * array(typecode).itemsize))
+
+
+@instrumented('lf_inverse')
+def lf_inverse(bwt_encoded, terminator='$'):
+    """
+    This function takes a BWT encoded string containing the terminator and returns the original string without it.
+    Row r of the first column holds the same character occurrence as position next_row[r] of the BWT encoded string,
+    so starting from the row of the terminator and following next_row yields the original string from left to right.
+    next_row is filled by a stable counting sort over the C-array, and the output buffer is preallocated,
+    so the whole inverse runs in time linear in the length of the input.
+    """
+    ln = len(bwt_encoded)
+    if ln == 0:
+        return ''
+    next_row = row_array(ln)
+    first = first_occurrences(bwt_encoded)
+    for i, char in enumerate(bwt_encoded):
+        next_row[first[char]] = i
+        first[char] += 1
+
+    string_original = [''] * (ln - 1)
+    current_row = next_row[bwt_encoded.index(terminator)]
+    for n in range(ln - 1):
+        string_original[n] = bwt_encoded[current_row]
+        current_row = next_row[current_row]
+    return ''.join(string_original)
@@ -0,0 +1,53 @@
+# bwt_package/lazy.py
+#-----------------------------------------------------------------#
+#Lazy imports of the heavy third-party modules
+#pandas, NumPy and matplotlib take most of the start-up time of the scripts, so they are only
+#imported the first time one of their attributes is used (e.g. when a DataFrame is built).
+#-----------------------------------------------------------------#
+
+import importlib
+import importlib.util
+
+
+class LazyModule:
+    """
+    This class stands in for a module that is imported on first attribute access:
+    pd = lazy_import('pandas') costs nothing until pd.DataFrame is used.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def module_available(name):
+    """
+    This function returns True if the module name can be imported, without importing it
+    (only the top-level package is looked up, since finding a submodule would import its parent).
+    """
+    try:
+        return importlib.util.find_spec(name.partition('.')[0]) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def lazy_import(name, optional=False):
+    """
+    This function returns a LazyModule for name. With optional=True it returns None instead
+    when the module is not installed, like the try/except ImportError pattern it replaces.
+    """
+    if optional and not module_available(name):
+        return None
+    return LazyModule(name)
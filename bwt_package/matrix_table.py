@@ -0,0 +1,119 @@
+# bwt_package/matrix_table.py
+#-----------------------------------------------------------------#
+#Virtualized Tk table for the BWT matrix views
+#Only the rows that fit on screen exist as Treeview items; scrolling asks the RotationMatrix or
+#InverseMatrix for the next visible rows, so a 100k-row matrix is browsed without ever being built.
+#-----------------------------------------------------------------#
+
+import tkinter as tk
+from tkinter import ttk
+
+#Number of rows shown at a time and number of characters shown of every rotation
+DEFAULT_VISIBLE_ROWS = 25
+DEFAULT_CELL_WIDTH = 60
+
+
+class MatrixTable(tk.Frame):
+    """
+    This class shows a RotationMatrix or InverseMatrix (see bwt_package.rotation_matrix) in a ttk.Treeview
+    with a vertical scrollbar. The Treeview only ever holds visible_rows items: when the view scrolls,
+    the items are refilled from matrix.preview(), which returns the first cell_width characters of a row.
+    A RotationMatrix also gets a column with the position of every rotation among the sorted rotations.
+    """
+
+    def __init__(self, master, matrix, visible_rows=DEFAULT_VISIBLE_ROWS, cell_width=DEFAULT_CELL_WIDTH):
+        super().__init__(master)
+        self.matrix = matrix
+        self.visible_rows = min(visible_rows, len(matrix)) or 1
+        self.cell_width = cell_width
+        self.first_row = 0
+        self.show_sorted_position = hasattr(matrix, 'sorted_position')
+
+        columns = ['Row'] + list(matrix.columns)
+        if self.show_sorted_position:
+            columns.insert(2, 'Sorted position')
+        self.tree = ttk.Treeview(self, columns=columns, show='headings', height=self.visible_rows, selectmode='none')
+        # Rotation columns are sized for cell_width characters, the other columns for a number or a character
+        rotation_width = 7 * min(self.cell_width, len(matrix)) + 30
+        for column in columns:
+            self.tree.heading(column, text=column)
+            wide = self.show_sorted_position and column in matrix.columns
+            self.tree.column(column, width=max(rotation_width, 150) if wide else 150, stretch=wide, anchor=tk.W)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+
+        # Jumping straight to a row number, since dragging the scrollbar is imprecise on large matrices
+        jump_frame = tk.Frame(self)
+        tk.Label(jump_frame, text=f"{len(matrix)} rows. Go to row:").pack(side=tk.LEFT)
+        self.jump_entry = tk.Entry(jump_frame, width=10)
+        self.jump_entry.pack(side=tk.LEFT)
+        self.jump_entry.bind('<Return>', self.jump)
+        tk.Button(jump_frame, text="Go", command=self.jump).pack(side=tk.LEFT)
+
+        jump_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        for widget in (self.tree, self.scrollbar):
+            widget.bind('<MouseWheel>', self.on_mouse_wheel)
+            widget.bind('<Button-4>', lambda event: self.scroll_to(self.first_row - 3))
+            widget.bind('<Button-5>', lambda event: self.scroll_to(self.first_row + 3))
+        self.tree.bind('<Up>', lambda event: self.scroll_to(self.first_row - 1))
+        self.tree.bind('<Down>', lambda event: self.scroll_to(self.first_row + 1))
+        self.tree.bind('<Prior>', lambda event: self.scroll_to(self.first_row - self.visible_rows))
+        self.tree.bind('<Next>', lambda event: self.scroll_to(self.first_row + self.visible_rows))
+        self.tree.bind('<Home>', lambda event: self.scroll_to(0))
+        self.tree.bind('<End>', lambda event: self.scroll_to(len(self.matrix)))
+        self.refresh()
+
+    def row_values(self, row):
+        """
+        This function returns the values displayed for one row of the matrix.
+        """
+        # Rotations longer than the cell are marked as cut
+        cells = [value + '...' if len(value) == self.cell_width < len(self.matrix) else value
+                 for value in self.matrix.preview(row, self.cell_width)]
+        values = [row] + cells
+        if self.show_sorted_position:
+            values.insert(2, self.matrix.sorted_position(row))
+        return values
+
+    def refresh(self):
+        """
+        This function refills the Treeview with the rows starting at first_row and updates the scrollbar.
+        """
+        self.tree.delete(*self.tree.get_children())
+        last_row = min(self.first_row + self.visible_rows, len(self.matrix))
+        for row in range(self.first_row, last_row):
+            self.tree.insert('', tk.END, values=self.row_values(row))
+        n = len(self.matrix) or 1
+        self.scrollbar.set(self.first_row / n, last_row / n)
+
+    def scroll_to(self, row):
+        """
+        This function shows the rows starting at row, keeping the last page full.
+        """
+        row = max(0, min(int(row), len(self.matrix) - self.visible_rows))
+        if row != self.first_row:
+            self.first_row = row
+            self.refresh()
+        return 'break'
+
+    def yview(self, *args):
+        # Called by the scrollbar with ('moveto', fraction) or ('scroll', amount, 'units' or 'pages')
+        if args[0] == 'moveto':
+            self.scroll_to(float(args[1]) * len(self.matrix))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            if args[2] == 'pages':
+                amount *= self.visible_rows
+            self.scroll_to(self.first_row + amount)
+
+    def on_mouse_wheel(self, event):
+        return self.scroll_to(self.first_row - (3 if event.delta > 0 else -3))
+
+    def jump(self, event=None):
+        try:
+            row = int(self.jump_entry.get())
+        except ValueError:
+            return
+        self.scroll_to(row)
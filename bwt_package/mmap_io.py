@@ -0,0 +1,199 @@
+# bwt_package/mmap_io.py
+#-----------------------------------------------------------------#
+#Memory-mapped input and output for genome-scale sequences
+#Input files are mapped instead of read into a str, FASTA regions are located through a
+#samtools-style .fai index, and results are written straight into a memory-mapped output file.
+#-----------------------------------------------------------------#
+
+import mmap
+import os
+import re
+import struct
+from collections import namedtuple
+
+from bwt_package.streaming import bwt_block_into, bwt_inverse_block_into
+
+#Mapped output layout: MAGIC, the length of the block and its primary index, then the BWT bytes
+MAGIC = b'BWTM\x01'
+_HEADER = struct.Struct('<QQ')
+HEADER_SIZE = len(MAGIC) + _HEADER.size
+
+#One line of a .fai index: sequence name, length, byte offset of the first base, bases per line, bytes per line
+FaiEntry = namedtuple('FaiEntry', ['name', 'length', 'offset', 'line_bases', 'line_bytes'])
+_REGION = re.compile(r'^(?P<name>[^:]+)(?::(?P<start>[\d,]+)(?:-(?P<end>[\d,]+))?)?$')
+
+
+def map_file(path):
+    """
+    This function maps a file read-only into memory and returns the mmap (an empty bytes object for an empty file).
+    """
+    with open(path, 'rb') as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def create_mapped_file(path, size):
+    """
+    This function creates (or truncates) a file of size bytes and returns it mapped for writing.
+    """
+    with open(path, 'w+b') as handle:
+        handle.truncate(size)
+        return mmap.mmap(handle.fileno(), size) if size else None
+
+
+def build_fai(fasta_path):
+    """
+    This function scans a FASTA file once and returns its .fai entries as a dictionary keyed by sequence name.
+    Every sequence must use the same line length throughout, apart from its last line, as samtools requires.
+    """
+    entries = {}
+    name = None
+    with open(fasta_path, 'rb') as handle:
+        offset = 0
+        for line in handle:
+            line_end = offset + len(line)
+            if line.startswith(b'>'):
+                if name is not None:
+                    entries[name] = FaiEntry(name, length, sequence_offset, line_bases, line_bytes)
+                name = line[1:].split(None, 1)[0].decode('utf-8') if line[1:].strip() else ''
+                length = 0
+                sequence_offset = line_end
+                line_bases = line_bytes = 0
+                short_line_seen = False
+            elif name is not None:
+                bases = len(line.rstrip(b'\r\n'))
+                if line_bases == 0:
+                    line_bases, line_bytes = bases, len(line)
+                elif short_line_seen or bases > line_bases:
+                    raise ValueError(f"Sequence '{name}' in {fasta_path} has lines of different lengths")
+                if bases < line_bases:
+                    short_line_seen = True
+                length += bases
+            offset = line_end
+        if name is not None:
+            entries[name] = FaiEntry(name, length, sequence_offset, line_bases, line_bytes)
+    return entries
+
+
+def write_fai(entries, fai_path):
+    """
+    This function writes .fai entries as a tab-separated samtools-compatible index file.
+    """
+    with open(fai_path, 'w') as handle:
+        for entry in entries.values():
+            handle.write('\t'.join(str(value) for value in entry) + '\n')
+
+
+def read_fai(fai_path):
+    """
+    This function reads a .fai index file and returns its entries as a dictionary keyed by sequence name.
+    """
+    entries = {}
+    with open(fai_path) as handle:
+        for line in handle:
+            fields = line.rstrip('\n').split('\t')
+            entries[fields[0]] = FaiEntry(fields[0], *(int(value) for value in fields[1:5]))
+    return entries
+
+
+def load_fai(fasta_path):
+    """
+    This function returns the .fai entries of a FASTA file, reading fasta_path + '.fai' when it is up to date and
+    building and saving it otherwise.
+    """
+    fai_path = fasta_path + '.fai'
+    if os.path.exists(fai_path) and os.path.getmtime(fai_path) >= os.path.getmtime(fasta_path):
+        return read_fai(fai_path)
+    entries = build_fai(fasta_path)
+    write_fai(entries, fai_path)
+    return entries
+
+
+def parse_region(region):
+    """
+    This function parses a region such as 'chr1', 'chr1:1000' or 'chr1:1,000-2,000' (1-based, inclusive, like samtools)
+    and returns (name, start, end) as 0-based half-open coordinates, end being None for the end of the sequence.
+    """
+    match = _REGION.match(region.strip())
+    if match is None:
+        raise ValueError(f"Invalid region '{region}'")
+    start = int(match.group('start').replace(',', '')) - 1 if match.group('start') else 0
+    end = int(match.group('end').replace(',', '')) if match.group('end') else None
+    if start < 0 or (end is not None and end < start):
+        raise ValueError(f"Invalid region '{region}'")
+    return match.group('name'), start, end
+
+
+def fetch_region(mapped, entry, start=0, end=None):
+    """
+    This function returns the bases of a FASTA sequence between start and end (0-based, half-open) as bytes,
+    copying only the lines of the region out of the mapped file.
+    """
+    end = entry.length if end is None else min(end, entry.length)
+    if start >= end:
+        return b''
+    if entry.line_bases == 0:
+        return b''
+    pieces = []
+    position = start
+    while position < end:
+        line, column = divmod(position, entry.line_bases)
+        count = min(entry.line_bases - column, end - position)
+        offset = entry.offset + line * entry.line_bytes + column
+        pieces.append(mapped[offset:offset + count])
+        position += count
+    return b''.join(pieces)
+
+
+def bwt_to_mapped_file(data, output_path, engine='auto'):
+    """
+    This function applies the block BWT to a bytes-like input (bytes, memoryview or mmap) and writes the result,
+    preceded by its length and primary index, directly into a memory-mapped output file.
+    It returns the primary index.
+    """
+    n = len(data)
+    output = create_mapped_file(output_path, HEADER_SIZE + n)
+    try:
+        with memoryview(output) as view:
+            with view[HEADER_SIZE:] as body:
+                primary_index = bwt_block_into(data, body, engine) if n else 0
+            view[:HEADER_SIZE] = MAGIC + _HEADER.pack(n, primary_index)
+        output.flush()
+    except BaseException:
+        output.close()
+        # Not leaving a zero-filled output file behind
+        os.remove(output_path)
+        raise
+    output.close()
+    return primary_index
+
+
+def bwt_inverse_mapped_file(input_path, output_path):
+    """
+    This function maps a file written by bwt_to_mapped_file() and writes the original bytes directly into
+    a memory-mapped output file. It returns the number of bytes written.
+    """
+    mapped = map_file(input_path)
+    try:
+        if len(mapped) < HEADER_SIZE or mapped[:len(MAGIC)] != MAGIC:
+            raise ValueError("Input is not a memory-mapped BWT file (bad magic number)")
+        n, primary_index = _HEADER.unpack_from(mapped, len(MAGIC))
+        if len(mapped) != HEADER_SIZE + n:
+            raise ValueError("Truncated memory-mapped BWT file")
+        output = create_mapped_file(output_path, n)
+        if output is None:
+            return 0
+        try:
+            with memoryview(mapped) as view, view[HEADER_SIZE:] as body:
+                bwt_inverse_block_into(body, primary_index, output)
+            output.flush()
+        except BaseException:
+            output.close()
+            os.remove(output_path)
+            raise
+        output.close()
+    finally:
+        if isinstance(mapped, mmap.mmap):
+            mapped.close()
+    return n
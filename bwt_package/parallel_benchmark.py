@@ -0,0 +1,77 @@
+# bwt_package/parallel_benchmark.py
+#-----------------------------------------------------------------#
+#Benchmark of the parallel block transform
+#Run with: python -m bwt_package.parallel_benchmark --size 8000000 --max-workers 32
+#-----------------------------------------------------------------#
+
+import argparse
+import io
+import os
+import random
+import time
+
+from bwt_package.streaming import DEFAULT_BLOCK_SIZE, bwt_inverse_stream, bwt_stream
+
+
+def worker_counts(max_workers):
+    """
+    This function returns the worker counts to benchmark: powers of two up to max_workers, plus max_workers itself.
+    """
+    counts = []
+    workers = 1
+    while workers < max_workers:
+        counts.append(workers)
+        workers *= 2
+    counts.append(max_workers)
+    return counts
+
+
+def run_benchmark(size, block_size=DEFAULT_BLOCK_SIZE, max_workers=None, engine='auto', seed=0):
+    """
+    This function transforms and inverts a random DNA sequence of size bytes with 1 to max_workers processes
+    and returns one dictionary of timings per worker count, including the speedup over a single worker.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    data = ''.join(random.Random(seed).choice('ACGT') for _ in range(size)).encode('ascii')
+    results = []
+    for workers in worker_counts(max_workers):
+        encoded = io.BytesIO()
+        start = time.perf_counter()
+        bwt_stream(io.BytesIO(data), encoded, block_size, engine, workers)
+        forward_time = time.perf_counter() - start
+
+        encoded.seek(0)
+        decoded = io.BytesIO()
+        start = time.perf_counter()
+        bwt_inverse_stream(encoded, decoded, workers)
+        inverse_time = time.perf_counter() - start
+        if decoded.getvalue() != data:
+            raise RuntimeError(f"Round trip failed with {workers} workers")
+
+        results.append({
+            'Workers': workers,
+            'ForwardTime': forward_time,
+            'InverseTime': inverse_time,
+            'ForwardSpeedup': results[0]['ForwardTime'] / forward_time if results else 1.0,
+            'InverseSpeedup': results[0]['InverseTime'] / inverse_time if results else 1.0,
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the parallel block BWT from 1 to N workers')
+    parser.add_argument('--size', type=int, default=8 * DEFAULT_BLOCK_SIZE, help='Input size in bytes')
+    parser.add_argument('--block-size', type=int, default=DEFAULT_BLOCK_SIZE, help='Block size in bytes')
+    parser.add_argument('--max-workers', type=int, default=None, help='Largest worker count (default: number of cores)')
+    parser.add_argument('--engine', type=str, default='auto', choices=['auto', 'sais', 'numpy'], help='Suffix array engine')
+    args = parser.parse_args(argv)
+
+    print(f"{'Workers':>8} {'Forward (s)':>12} {'Speedup':>8} {'Inverse (s)':>12} {'Speedup':>8}")
+    for row in run_benchmark(args.size, args.block_size, args.max_workers, args.engine):
+        print(f"{row['Workers']:>8} {row['ForwardTime']:>12.3f} {row['ForwardSpeedup']:>8.2f} "
+              f"{row['InverseTime']:>12.3f} {row['InverseSpeedup']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# bwt_package/prefix_doubling.py
+#-----------------------------------------------------------------#
+#Vectorised suffix sorting by prefix doubling (Manber-Myers / Larsson-Sadakane)
+#Every round sorts the rotations by the ranks of their first 2k characters using NumPy,
+#so the work is done on integer arrays instead of Python objects. NumPy is optional.
+#-----------------------------------------------------------------#
+
+from bwt_package.lazy import lazy_import
+
+#NumPy is optional and only imported when an engine or method uses it
+np = lazy_import('numpy', optional=True)
+
+
+def prefix_doubling_suffix_array(string):
+    """
+    This function takes a string and returns the start positions of its rotations in lexicographically sorted order.
+    The rotations are ranked by their first character, then repeatedly re-sorted on the pair
+    (rank of the first k characters, rank of the next k characters) with k doubling each round,
+    until every rank is distinct or the whole rotation has been compared.
+    It works for any alphabet, since characters are ranked by their Unicode code points, and requires NumPy.
+    """
+    if np is None:
+        raise ImportError("The 'numpy' suffix array engine requires NumPy to be installed")
+    n = len(string)
+    if n == 0:
+        return []
+
+    if hasattr(string, 'character_codes'):
+        # Packed sequences (PackedDNA) hand over their code points without being decoded to a str
+        codes = np.asarray(string.character_codes())
+    else:
+        codes = np.frombuffer(string.encode('utf-32-le'), dtype=np.uint32)
+    return prefix_doubling_order(codes).tolist()
+
+
+def prefix_doubling_order(codes):
+    """
+    This function takes a NumPy array of integer character codes and returns a NumPy array with the start
+    positions of the rotations of the coded text in sorted order.
+    """
+    n = len(codes)
+    # Ranks must be dense (0 to n - 1) for the combined sort key below
+    _, rank = np.unique(codes, return_inverse=True)
+    rank = rank.astype(np.int64).reshape(n)
+    order = np.argsort(rank, kind='stable')
+    k = 1
+    while rank.max() < n - 1 and k < n:
+        # Combining both ranks into one key keeps each round to a single stable argsort
+        key = rank * n
+        key[:n - k] += rank[k:]
+        key[n - k:] += rank[:k]
+        del order
+        order = np.argsort(key, kind='stable')
+        sorted_key = key[order]
+        del key
+        boundaries = np.empty(n, dtype=np.int64)
+        boundaries[0] = 0
+        np.not_equal(sorted_key[1:], sorted_key[:-1], out=boundaries[1:], casting='unsafe')
+        del sorted_key
+        # The arrays of a round are freed or updated in place, so a round holds about four n-sized arrays at once
+        np.cumsum(boundaries, out=boundaries)
+        rank[order] = boundaries
+        del boundaries
+        k *= 2
+    return order
@@ -0,0 +1,216 @@
+# bwt_package/rotation_matrix.py
+#-----------------------------------------------------------------#
+#Lazy views of the BWT rotation matrix
+#Rows are computed on demand, and a Pandas DataFrame is only built for the rows that are
+#actually displayed.
+#-----------------------------------------------------------------#
+
+import struct
+import sys
+from bisect import bisect_right
+from collections import Counter
+
+from bwt_package.instrumentation import instrumented
+from bwt_package.lazy import lazy_import
+
+#pandas is only imported when a DataFrame is built
+pd = lazy_import('pandas')
+
+#Size of a Python int object and of a list slot, used to estimate the memory held by the suffix array
+_INT_SIZE = sys.getsizeof(2 ** 40)
+_POINTER_SIZE = struct.calcsize('P')
+
+
+def _string_size(string):
+    # PackedDNA strings report their packed footprint, str their object size
+    return getattr(string, 'nbytes', None) or sys.getsizeof(string)
+
+
+def _int_list_size(n):
+    # A list of n int objects: the list with its slots and the int objects themselves
+    return sys.getsizeof([]) + (_POINTER_SIZE + _INT_SIZE) * n
+
+
+class _MatrixView:
+    """
+    This class holds the paging and display logic shared by the matrix views.
+    Subclasses define the column names and compute the values of a single row in _row().
+    """
+
+    columns = []
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def __getitem__(self, row):
+        return self._row(self._check_row(row))
+
+    def _row(self, row):
+        raise NotImplementedError
+
+    def preview(self, row, width):
+        """
+        This function returns the cells of row with every value cut to its first width characters,
+        for displays that only show the beginning of each row.
+        """
+        return tuple(value[:width] for value in self[row])
+
+    @instrumented('dataframe')
+    def page(self, start, stop):
+        """
+        This function returns the rows from start (inclusive) to stop (exclusive) as a Pandas DataFrame,
+        indexed by their row number in the full matrix.
+        """
+        rows = range(*slice(start, stop).indices(len(self)))
+        values = [self._row(i) for i in rows]
+        return pd.DataFrame({
+            column: [row[index] for row in values] for index, column in enumerate(self.columns)
+        }, index=rows)
+
+    def to_frame(self):
+        """
+        This function materialises the whole matrix as a Pandas DataFrame.
+        """
+        return self.page(0, len(self))
+
+    def __str__(self):
+        # Displaying the matrix the way Pandas does: every row for short strings, the head and tail otherwise
+        n = len(self)
+        max_colwidth = pd.get_option("display.max_colwidth")
+        if n <= pd.get_option("display.max_rows"):
+            return self.to_frame().to_string(max_colwidth=max_colwidth)
+        half = pd.get_option("display.min_rows") // 2
+        frame = pd.concat([self.page(0, half), self.page(n - half, n)])
+        lines = frame.to_string(max_colwidth=max_colwidth).splitlines()
+        lines.insert(half + 1, "..")
+        lines.append("")
+        lines.append(f"[{n} rows x {len(self.columns)} columns]")
+        return "\n".join(lines)
+
+    __repr__ = __str__
+
+    def _check_row(self, row):
+        n = len(self)
+        if row < 0:
+            row += n
+        if not 0 <= row < n:
+            raise IndexError("matrix row out of range")
+        return row
+
+
+class RotationMatrix(_MatrixView):
+    """
+    This class is a lazy, paginated view of the matrix returned by bwt().
+    Row i holds the i-th cyclic rotation of the string ("Possible rotations") and the i-th rotation in
+    sorted order ("Sorted"). Rows are built from the string and its suffix array when requested, so creating
+    the view costs nothing beyond the suffix array that bwt() already computed.
+    """
+
+    columns = ["Possible rotations", "Sorted"]
+
+    def __init__(self, string, positions):
+        self.string = string
+        self.positions = positions
+        self._ranks = None
+
+    def __len__(self):
+        return len(self.string)
+
+    @property
+    def nbytes(self):
+        """
+        An estimate of the memory held by the view in bytes: the string, the suffix array (a NumPy array, or a list
+        and its int objects) and the list of sorted positions. The list is counted before sorted_position() builds
+        it, so a view held in the cache never grows past the size it was stored with.
+        """
+        n = len(self.positions)
+        positions_size = getattr(self.positions, 'nbytes', None)
+        if positions_size is None:
+            positions_size = _int_list_size(n)
+        return _string_size(self.string) + positions_size + _int_list_size(n)
+
+    def rotation(self, row, width=None):
+        """
+        This function returns the rotation of the string starting at position row
+        (only its first width characters if width is given).
+        """
+        return self._rotation(self._check_row(row), width)
+
+    def sorted_rotation(self, row, width=None):
+        """
+        This function returns the rotation found at position row once all rotations are sorted
+        (only its first width characters if width is given).
+        """
+        return self._rotation(self.positions[self._check_row(row)], width)
+
+    def _rotation(self, start, width):
+        # A prefix of the rotation is sliced out directly, without building the whole rotation first
+        if width is None or width >= len(self.string):
+            return self.string[start:] + self.string[:start]
+        prefix = self.string[start:start + width]
+        return prefix + self.string[:width - len(prefix)]
+
+    def sorted_position(self, row):
+        """
+        This function returns the position of the rotation starting at row within the sorted rotations.
+        """
+        row = self._check_row(row)
+        if self._ranks is None:
+            self._ranks = [0] * len(self.positions)
+            for rank, start in enumerate(self.positions):
+                self._ranks[start] = rank
+        return self._ranks[row]
+
+    def to_frame(self):
+        """
+        This function materialises the whole matrix as a Pandas DataFrame.
+        It needs memory proportional to the square of the string length, so it should only be used on short strings.
+        """
+        return self.page(0, len(self))
+
+    def _row(self, row):
+        return self.rotation(row), self.sorted_rotation(row)
+
+    def preview(self, row, width):
+        return self.rotation(row, width), self.sorted_rotation(row, width)
+
+
+class InverseMatrix(_MatrixView):
+    """
+    This class is a lazy view of the visualization returned by bwt_inverse().
+    Row i holds the i-th character of the first column of the BWT matrix ("First Column") and the i-th
+    character of the BWT encoded string, i.e. the last column ("Original Sequence Column").
+    The first column is never stored: it is looked up from the character counts of the encoded string.
+    """
+
+    columns = ["First Column", "Original Sequence Column"]
+
+    def __init__(self, bwt_encoded):
+        self.bwt_encoded = bwt_encoded
+        counts = Counter(bwt_encoded)
+        self._characters = sorted(counts)
+        self._starts = []
+        total = 0
+        for char in self._characters:
+            self._starts.append(total)
+            total += counts[char]
+
+    def __len__(self):
+        return len(self.bwt_encoded)
+
+    @property
+    def nbytes(self):
+        """
+        An estimate of the memory held by the view in bytes: the encoded string and the character starts.
+        """
+        return _string_size(self.bwt_encoded) + sys.getsizeof(self._starts) + _INT_SIZE * len(self._starts)
+
+    def first_column(self, row):
+        """
+        This function returns the character of the first column of the BWT matrix at position row.
+        """
+        row = self._check_row(row)
+        return self._characters[bisect_right(self._starts, row) - 1]
+
+    def _row(self, row):
+        return self.first_column(row), self.bwt_encoded[row]
@@ -0,0 +1,213 @@
+# bwt_package/run_length.py
+#-----------------------------------------------------------------#
+#Run-length compressed BWT with toehold locate (r-index)
+#The BWT of a repetitive sequence is made of few runs of equal characters, so it is stored as r run heads
+#and r run starts instead of n characters. rank, select and the LF-mapping work over the runs, and locate()
+#follows the r-index of Gagie, Navarro and Prezza: backward search keeps the text position of one matching row
+#(the toehold) and the others are derived from it with the phi function, which needs O(r) samples only.
+#-----------------------------------------------------------------#
+
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import groupby
+
+from bwt_package.backward_search import BackwardSearch
+from bwt_package.suffix_array import bwt_from_suffix_array, suffix_array
+
+
+def count_runs(bwt_encoded):
+    """
+    This function returns the number of runs of equal characters r in a BWT encoded string.
+    """
+    return sum(1 for _ in groupby(bwt_encoded))
+
+
+class RunLengthBWT(BackwardSearch):
+    """
+    This class stores a BWT encoded string (including its '$') as the character and start row of each of its r runs.
+    For every character, the runs of that character and the number of occurrences before each of them are kept,
+    so rank() and select() take two binary searches and the memory used grows with r rather than n.
+    For locate(), the text position of the last row of every run and the phi samples (the text position
+    before every run start row, with the text position of the row above it) are stored: 3r numbers in all.
+    If the suffix array positions are not passed in, the samples are recovered by sample_by_lf_walk().
+    """
+
+    def __init__(self, bwt_encoded, positions=None):
+        self.n = len(bwt_encoded)
+        heads = []
+        self.run_starts = array('q')
+        self.char_runs = {}
+        self.char_ranks = {}
+        self.counts = {}
+        start = 0
+        for char, run in groupby(bwt_encoded):
+            length = sum(1 for _ in run)
+            # char_ranks[char][k] is the number of occurrences of char before its k-th run
+            self.char_runs.setdefault(char, array('q')).append(len(heads))
+            self.char_ranks.setdefault(char, array('q')).append(self.counts.get(char, 0))
+            self.counts[char] = self.counts.get(char, 0) + length
+            self.run_starts.append(start)
+            heads.append(char)
+            start += length
+        self.run_chars = ''.join(heads)
+        self.c_table = {}
+        total = 0
+        for char in sorted(self.counts):
+            self.c_table[char] = total
+            total += self.counts[char]
+        self._sample_runs(positions)
+
+    @classmethod
+    def from_string(cls, string, engine='auto'):
+        """
+        This function builds the run-length BWT of a string with the same suffix array engine used by bwt(),
+        taking the samples from the suffix array it has just built.
+        """
+        string += '$'
+        positions = suffix_array(string, engine)
+        return cls(bwt_from_suffix_array(string, positions), positions)
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def runs(self):
+        """
+        The number of runs r of the BWT.
+        """
+        return len(self.run_chars)
+
+    def _run_end(self, run):
+        # Last row of a run
+        return self.run_starts[run + 1] - 1 if run + 1 < len(self.run_starts) else self.n - 1
+
+    def _sample_runs(self, positions):
+        # Text positions of the first and last row of every run, the only rows the samples are taken from
+        rows = set(self.run_starts)
+        rows.update(self._run_end(run) for run in range(self.runs))
+        if positions is not None:
+            text_positions = {row: positions[row] for row in rows}
+        elif '$' in self.counts:
+            text_positions = self.sample_by_lf_walk(self.select('$', 0), lambda row, position: row in rows)
+        else:
+            text_positions = None
+        if not text_positions:
+            self.end_samples = self.phi_keys = self.phi_values = array('q')
+            return
+        self.end_samples = array('q', (text_positions[self._run_end(run)] for run in range(self.runs)))
+
+        # phi(p) is the text position of the row above the row of position p. It is only stored for the positions p
+        # whose next position starts a run: in between, phi(p) = phi(p + 1) - 1
+        phi = []
+        for start in self.run_starts:
+            above = self.lf(start) - 1
+            if above < 0:
+                continue
+            # The row above is the LF-mapping of an occurrence of its first column character that ends a run
+            char = self._first_column(above)
+            last = self.select(char, above - self.c_table[char])
+            phi.append(((text_positions[start] - 1) % self.n, (text_positions[last] - 1) % self.n))
+        phi.sort()
+        self.phi_keys = array('q', (key for key, _ in phi))
+        self.phi_values = array('q', (value for _, value in phi))
+
+    def _first_column(self, row):
+        # Character of row in the sorted first column of the BWT matrix
+        chars = sorted(self.c_table)
+        return chars[bisect_right([self.c_table[char] for char in chars], row) - 1]
+
+    def access(self, row):
+        """
+        This function returns the character of the BWT at row.
+        """
+        return self.run_chars[bisect_right(self.run_starts, row) - 1]
+
+    def rank(self, char, position):
+        """
+        This function returns the number of occurrences of char in the first position characters of the BWT.
+        """
+        runs = self.char_runs.get(char)
+        if runs is None or position <= 0:
+            return 0
+        position = min(position, self.n)
+        run = bisect_right(self.run_starts, position - 1) - 1
+        k = bisect_right(runs, run) - 1
+        if k < 0:
+            return 0
+        # The occurrences before the last run of char up to row position - 1, then the part of that run before position
+        char_run = runs[k]
+        end = position if char_run == run else self._run_end(char_run) + 1
+        return self.char_ranks[char][k] + end - self.run_starts[char_run]
+
+    def select(self, char, k):
+        """
+        This function returns the row of the k-th occurrence (0-based) of char in the BWT.
+        """
+        ranks = self.char_ranks[char]
+        if not 0 <= k < self.counts[char]:
+            raise IndexError(f"'{char}' occurs {self.counts[char]} times in the BWT")
+        index = bisect_right(ranks, k) - 1
+        return self.run_starts[self.char_runs[char][index]] + k - ranks[index]
+
+    occ = rank
+
+    def first_row(self, char):
+        """
+        This function returns the C-table entry of char, summed from the run lengths, or None if char is absent.
+        """
+        return self.c_table.get(char)
+
+    def phi(self, position):
+        """
+        This function returns the text position of the row just above the row of the suffix starting at position.
+        """
+        index = bisect_left(self.phi_keys, position)
+        return (self.phi_values[index] - (self.phi_keys[index] - position)) % self.n
+
+    def _toehold_search(self, pattern):
+        # Backward search that also follows the text position of the last matching row (the toehold)
+        top, bottom = 0, self.n
+        toehold = self.end_samples[-1] if self.end_samples else None
+        for char in reversed(pattern):
+            first = self.c_table.get(char)
+            if first is None:
+                return 0, 0, None
+            rank_top = self.rank(char, top)
+            rank_bottom = self.rank(char, bottom)
+            if rank_top >= rank_bottom:
+                return 0, 0, None
+            if toehold is not None:
+                if self.access(bottom - 1) == char:
+                    toehold = (toehold - 1) % self.n
+                else:
+                    # The last occurrence of char in the range ends a run, whose text position is sampled
+                    last = self.select(char, rank_bottom - 1)
+                    toehold = (self.end_samples[bisect_right(self.run_starts, last) - 1] - 1) % self.n
+            top, bottom = first + rank_top, first + rank_bottom
+        return top, bottom, toehold
+
+    def locate(self, pattern):
+        """
+        This function returns the sorted list of positions at which pattern occurs in the indexed string.
+        The backward search gives the position of the last matching row, and phi() gives the position of every
+        row above it in turn, so a query costs one binary search per occurrence whatever the length of the text.
+        """
+        if not self.end_samples:
+            raise ValueError("locate() needs the text positions of the runs, which a BWT without '$' does not give")
+        top, bottom, toehold = self._toehold_search(pattern)
+        if top >= bottom:
+            return []
+        located = [toehold]
+        for _ in range(bottom - top - 1):
+            located.append(self.phi(located[-1]))
+        return sorted(located)
+
+    def memory_size(self):
+        """
+        This function returns the size in bytes of the run-length BWT and its locate samples, which grows with
+        the number of runs r (one byte per run head is assumed for the characters).
+        """
+        arrays = [self.run_starts, self.end_samples, self.phi_keys, self.phi_values]
+        arrays.extend(self.char_runs.values())
+        arrays.extend(self.char_ranks.values())
+        return len(self.run_chars) + sum(values.itemsize * len(values) for values in arrays)
@@ -9,6 +9,9 @@ setup(
     install_requires=[
         'pandas',
     ],
+    extras_require={
+        'numpy': ['numpy'],
+    },
     entry_points={
         'console_scripts': [
             'bwt_script = bwt_package.bwt_script:main',
@@ -0,0 +1,217 @@
+# bwt_package/streaming.py
+#-----------------------------------------------------------------#
+#Block-based streaming Burrows-Wheeler Transform
+#The input is read in fixed-size blocks (bzip2 style) and every block is transformed on its own,
+#so memory use is bounded by the block size whatever the size of the input file.
+#Blocks are independent, so they are fanned out over a process pool and written back in order.
+#-----------------------------------------------------------------#
+
+import os
+import struct
+from collections import deque
+
+from bwt_package.instrumentation import instrumented
+from bwt_package.inverse import first_occurrences, row_array
+from bwt_package.prefix_doubling import np
+from bwt_package.suffix_array import byte_suffix_array
+
+#Stream layout: MAGIC, the block size, then for every block its length and primary index followed by its BWT bytes
+MAGIC = b'BWTS\x01'
+DEFAULT_BLOCK_SIZE = 900000
+_HEADER = struct.Struct('<I')
+_BLOCK_HEADER = struct.Struct('<II')
+
+
+@instrumented('bwt_block')
+def bwt_block(data, engine='auto'):
+    """
+    This function takes a block of bytes and returns its primary index and BWT encoded bytes.
+    The block is sorted as if it ended with a terminator smaller than every byte, as '$' does in bwt();
+    the terminator is left out of the output and its row is recorded as the primary index instead.
+    """
+    encoded = bytearray(len(data))
+    primary_index = bwt_block_into(data, encoded, engine)
+    return primary_index, bytes(encoded)
+
+
+def bwt_block_into(data, out, engine='auto'):
+    """
+    This function works like bwt_block() but writes the BWT encoded bytes into the writable buffer out
+    (a bytearray, memoryview or mmap of len(data) bytes) and returns the primary index.
+    data may be any bytes-like buffer, including a memoryview or mmap, so nothing is copied into a str.
+    """
+    # The views are released on the way out, even on error, so that a mapped data or out can be closed
+    with memoryview(data) as buffer, buffer.cast('B') as data:
+        positions = byte_suffix_array(data, engine)
+        if not isinstance(positions, list):
+            return _gather_into(data, positions, out)
+        k = 0
+        primary_index = 0
+        for row, start in enumerate(positions):
+            if start == 0:
+                primary_index = row
+            else:
+                out[k] = data[start - 1]
+                k += 1
+        return primary_index
+
+
+def _gather_into(data, positions, out):
+    # Writes the BWT of a NumPy suffix array with one vectorised gather instead of a Python loop over the positions
+    source = target = None
+    try:
+        source = np.frombuffer(data, dtype=np.uint8)
+        target = np.frombuffer(out, dtype=np.uint8)
+        starts = positions[positions > 0]
+        starts -= 1
+        target[:] = source[starts]
+        return int(np.flatnonzero(positions == 0)[0])
+    finally:
+        # The arrays export the buffers of data and out, which the caller releases (and may close) afterwards
+        del source, target
+
+
+@instrumented('bwt_inverse_block')
+def bwt_inverse_block(encoded, primary_index):
+    """
+    This function takes the BWT encoded bytes of a block and its primary index and returns the original block.
+    It follows the same LF-mapping as bwt_inverse(), with the terminator re-inserted at the primary index.
+    """
+    original = bytearray(len(encoded))
+    bwt_inverse_block_into(encoded, primary_index, original)
+    return bytes(original)
+
+
+def bwt_inverse_block_into(encoded, primary_index, out):
+    """
+    This function works like bwt_inverse_block() but writes the original bytes into the writable buffer out
+    (a bytearray, memoryview or mmap of len(encoded) bytes). encoded may be any bytes-like buffer.
+    """
+    with memoryview(encoded) as buffer, buffer.cast('B') as encoded:
+        n = len(encoded)
+        if not 0 <= primary_index <= n:
+            raise ValueError(f"Primary index {primary_index} is out of range for a block of {n} bytes")
+        # Row 0 of the first column is the terminator, so every byte starts one row further down
+        first = {byte: row + 1 for byte, row in first_occurrences(encoded).items()}
+        next_row = row_array(n + 1)
+        next_row[0] = primary_index
+        for i, byte in enumerate(encoded):
+            row = i if i < primary_index else i + 1
+            next_row[first[byte]] = row
+            first[byte] += 1
+
+        current_row = next_row[primary_index]
+        for k in range(n):
+            out[k] = encoded[current_row if current_row < primary_index else current_row - 1]
+            current_row = next_row[current_row]
+
+
+def iter_blocks(infile, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    This function reads a binary file object and yields it in blocks of at most block_size bytes.
+    """
+    while True:
+        block = infile.read(block_size)
+        if not block:
+            return
+        yield block
+
+
+def map_blocks(function, blocks, workers=None):
+    """
+    This function applies function to every argument tuple in blocks and yields the results in input order.
+    With more than one worker the calls run in a ProcessPoolExecutor (workers defaults to the number of cores),
+    keeping at most two blocks per worker in flight so memory stays bounded by the block size.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if workers == 1:
+        for arguments in blocks:
+            yield function(*arguments)
+        return
+    # Imported here so that single-process use does not pay for loading multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for arguments in blocks:
+            pending.append(executor.submit(function, *arguments))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def bwt_stream(infile, outfile, block_size=DEFAULT_BLOCK_SIZE, engine='auto', workers=None):
+    """
+    This function transforms a binary input file object block by block and writes the framed BWT stream to outfile.
+    Blocks are transformed by workers processes (one per core by default). It returns the number of blocks written.
+    """
+    if block_size <= 0:
+        raise ValueError("block_size must be a positive number of bytes")
+    outfile.write(MAGIC)
+    outfile.write(_HEADER.pack(block_size))
+    blocks = 0
+    arguments = ((block, engine) for block in iter_blocks(infile, block_size))
+    for primary_index, encoded in map_blocks(bwt_block, arguments, workers):
+        outfile.write(_BLOCK_HEADER.pack(len(encoded), primary_index))
+        outfile.write(encoded)
+        blocks += 1
+    return blocks
+
+
+def bwt_blocks(data, block_size=DEFAULT_BLOCK_SIZE, engine='auto', workers=None):
+    """
+    This function splits an in-memory bytes object into blocks, transforms them in parallel and returns
+    the list of (primary_index, encoded) pairs in block order.
+    """
+    if block_size <= 0:
+        raise ValueError("block_size must be a positive number of bytes")
+    arguments = ((data[start:start + block_size], engine) for start in range(0, len(data), block_size))
+    return list(map_blocks(bwt_block, arguments, workers))
+
+
+def bwt_inverse_blocks(blocks, workers=None):
+    """
+    This function takes the (primary_index, encoded) pairs returned by bwt_blocks(), decodes them in parallel
+    and returns the reassembled original bytes.
+    """
+    arguments = ((encoded, primary_index) for primary_index, encoded in blocks)
+    return b''.join(map_blocks(bwt_inverse_block, arguments, workers))
+
+
+def iter_stream_blocks(infile):
+    """
+    This function reads a framed BWT stream written by bwt_stream() and yields (encoded, primary_index) for every block.
+    """
+    if infile.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Input is not a BWT stream (bad magic number)")
+    _read_exactly(infile, _HEADER.size)
+    while True:
+        header = infile.read(_BLOCK_HEADER.size)
+        if not header:
+            return
+        if len(header) != _BLOCK_HEADER.size:
+            raise ValueError("Truncated BWT stream")
+        length, primary_index = _BLOCK_HEADER.unpack(header)
+        yield _read_exactly(infile, length), primary_index
+
+
+def bwt_inverse_stream(infile, outfile, workers=None):
+    """
+    This function reads a framed BWT stream written by bwt_stream() and writes the original bytes to outfile.
+    Blocks are decoded by workers processes (one per core by default). It returns the number of blocks decoded.
+    """
+    blocks = 0
+    for original in map_blocks(bwt_inverse_block, iter_stream_blocks(infile), workers):
+        outfile.write(original)
+        blocks += 1
+    return blocks
+
+
+def _read_exactly(infile, size):
+    data = infile.read(size)
+    if len(data) != size:
+        raise ValueError("Truncated BWT stream")
+    return data
@@ -0,0 +1,327 @@
+# bwt_package/suffix_array.py
+#-----------------------------------------------------------------#
+#Suffix array construction used behind bwt()
+#Engines are kept in a registry and selected by name or by the 'auto' policy. The pure Python engine is
+#SA-IS (induced sorting), which runs in linear time and never materialises the rotations of the input string;
+#a NumPy prefix-doubling engine is used when available.
+#-----------------------------------------------------------------#
+
+import os
+from collections import namedtuple
+
+from bwt_package.instrumentation import instrumented
+from bwt_package.lazy import module_available
+from bwt_package.prefix_doubling import np, prefix_doubling_order, prefix_doubling_suffix_array
+
+#Strings up to this length (e.g. sequencing reads) are sorted directly by the 'auto' engine
+SHORT_INPUT_LENGTH = 512
+#Engines of byte_suffix_array(), which sorts byte blocks with a virtual terminator (--stream and --mmap)
+BLOCK_ENGINES = ['sais', 'numpy']
+
+
+#Define the suffix array construction used by the forward transform
+@instrumented('suffix_array')
+def suffix_array(string, engine='auto'):
+    """
+    This function takes a string ending with the EOF character '$' and returns the start positions of its
+    rotations in lexicographically sorted order, i.e. the order of the "Sorted" column of the BWT matrix.
+    The engine is chosen by name from the SUFFIX_ARRAY_ENGINES registry: 'naive' sorts the rotations themselves,
+    'sort' sorts the suffixes, 'sais' is the pure Python linear-time engine and 'numpy' the vectorised
+    prefix-doubling engine. 'auto' lets choose_engine() pick one from the length and content of the string and
+    the free memory.
+    """
+    if engine == 'auto':
+        engine = choose_engine(string)
+    if engine not in SUFFIX_ARRAY_ENGINES:
+        raise ValueError(f"Unknown suffix array engine '{engine}', expected one of: {', '.join(engine_choices())}")
+    return SUFFIX_ARRAY_ENGINES[engine].function(string)
+
+
+def naive_suffix_array(string):
+    """
+    This function returns the sorted rotation order of a string the way the BWT is defined: it builds every
+    cyclic rotation of the string and sorts them. It is kept as a reference for teaching and testing,
+    since the rotations take memory quadratic in the length of the string.
+    """
+    string = str(string)
+    rotations = [string[i:] + string[:i] for i in range(len(string))]
+    return sorted(range(len(string)), key=rotations.__getitem__)
+
+
+def sorted_suffix_array(string):
+    """
+    This function returns the sorted rotation order of a string by sorting its suffixes with the built-in sort.
+    Each comparison runs in C, which makes it the fastest engine for short strings such as sequencing reads,
+    but the suffixes take memory quadratic in the length of the string.
+    """
+    string = str(string)
+    if string.count(string[-1:]) != 1:
+        return sorted(range(len(string)), key=lambda i: string[i:] + string[:i])
+    return sorted(range(len(string)), key=lambda i: string[i:])
+
+
+def sais_suffix_array(string):
+    """
+    This function returns the sorted rotation order of a string using the pure Python SA-IS engine.
+    When the final character occurs only once in the string, sorting the rotations is the same as sorting
+    the suffixes, so the order is computed by SA-IS in linear time. If the terminator is repeated
+    (e.g. the user typed a '$'), the rotations are compared directly so the output stays identical to the
+    rotation sort.
+    """
+    n = len(string)
+    if n == 0:
+        return []
+    if string.count(string[-1]) != 1:
+        return sorted(range(n), key=lambda i: string[i:] + string[:i])
+
+    # Map every character to its rank in the alphabet, keeping 0 free for the virtual sentinel
+    alphabet = {char: rank for rank, char in enumerate(sorted(set(string)), start=1)}
+    text = [alphabet[char] for char in string]
+    text.append(0)
+    # The virtual sentinel is always the smallest suffix, so it is dropped from the result
+    return _sais(text, len(alphabet) + 1)[1:]
+
+
+def byte_suffix_array(data, engine='auto'):
+    """
+    This function takes a block of bytes (or any buffer such as a memoryview or mmap) and returns the suffix array
+    of the block followed by a virtual terminator that sorts before every byte value. Position len(data) is the
+    terminator itself, so the bytes may contain any value, including '$', without falling back to comparing rotations.
+    The 'numpy' engine returns the suffix array as a NumPy array, which is not turned into a list of n Python
+    integers (several times the size of the block); the 'sais' engine returns a list.
+    """
+    if engine == 'auto':
+        engine = _choose_engine(len(data) + 1, ['numpy', 'sais'])
+    if engine == 'numpy':
+        if np is None:
+            raise ImportError("The 'numpy' suffix array engine requires NumPy to be installed")
+        # Byte values fit in 16-bit codes once shifted up to make room for the terminator
+        codes = np.empty(len(data) + 1, dtype=np.uint16)
+        codes[:-1] = np.frombuffer(data, dtype=np.uint8)
+        codes[:-1] += 1
+        codes[-1] = 0
+        return prefix_doubling_order(codes)
+    if engine != 'sais':
+        raise ValueError(f"Unknown block suffix array engine '{engine}', expected one of: auto, {', '.join(BLOCK_ENGINES)}")
+    text = [byte + 1 for byte in memoryview(data).cast('B')]
+    text.append(0)
+    return _sais(text, 257)
+
+
+#An engine of the registry: its sorting function, a description, an estimate of its memory use in bytes
+#for a string of n characters, and the module it needs (None for the standard library only)
+Engine = namedtuple('Engine', ['name', 'function', 'description', 'memory', 'requires'])
+
+#Suffix array engines selectable by name
+SUFFIX_ARRAY_ENGINES = {}
+
+
+def register_engine(name, function, description, memory, requires=None):
+    """
+    This function adds a suffix array engine to SUFFIX_ARRAY_ENGINES, making it selectable by name in bwt()
+    and every frontend. function takes a string ending with its terminator and returns the sorted rotation order;
+    memory(n) estimates the bytes it needs for n characters, which the 'auto' policy compares with the free memory.
+    """
+    SUFFIX_ARRAY_ENGINES[name] = Engine(name, function, description, memory, requires)
+
+
+def engine_available(name):
+    """
+    This function returns True if the engine name is registered and the module it requires is installed.
+    """
+    engine = SUFFIX_ARRAY_ENGINES.get(name)
+    return engine is not None and (engine.requires is None or module_available(engine.requires))
+
+
+def available_engines():
+    """
+    This function returns the names of the registered engines that can run here, in alphabetical order.
+    """
+    return [name for name in sorted(SUFFIX_ARRAY_ENGINES) if engine_available(name)]
+
+
+def engine_choices():
+    """
+    This function returns the engine names accepted by the command-line options: 'auto' and every registered engine.
+    """
+    return ['auto'] + sorted(SUFFIX_ARRAY_ENGINES)
+
+
+def available_memory():
+    """
+    This function returns the physical memory currently free in bytes, or None where it cannot be queried.
+    """
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def choose_engine(string):
+    """
+    This function implements the 'auto' engine policy and returns the name of the engine to use for string:
+    - if the last character (the terminator) also occurs inside the string, every engine has to compare whole
+      rotations, so the 'naive' rotation sort is used directly;
+    - strings of at most SHORT_INPUT_LENGTH characters (e.g. sequencing reads) are sorted directly with 'sort';
+    - longer strings use 'numpy' when NumPy is installed and 'sais' otherwise;
+    an engine whose estimated memory does not fit in the free memory is skipped for the next one that does.
+    """
+    n = len(string)
+    if n and string.count(string[-1]) != 1:
+        return 'naive'
+    if n <= SHORT_INPUT_LENGTH:
+        return _choose_engine(n, ['sort', 'numpy', 'sais'])
+    return _choose_engine(n, ['numpy', 'sais'])
+
+
+def _choose_engine(n, preferences):
+    # The first available engine that fits in memory, else the available engine needing the least memory
+    candidates = [name for name in preferences if engine_available(name)]
+    free_memory = available_memory()
+    if free_memory is not None:
+        for name in candidates:
+            if SUFFIX_ARRAY_ENGINES[name].memory(n) <= free_memory:
+                return name
+        return min(candidates, key=lambda name: SUFFIX_ARRAY_ENGINES[name].memory(n))
+    return candidates[0]
+
+
+register_engine('naive', naive_suffix_array,
+                "Sorts the list of every rotation, as in the textbook definition (quadratic memory; for teaching)",
+                lambda n: n * n + 64 * n)
+register_engine('sort', sorted_suffix_array,
+                "Sorts the suffixes with the built-in sort (fastest for short strings, quadratic memory)",
+                lambda n: n * n // 2 + 64 * n)
+register_engine('sais', sais_suffix_array,
+                "Pure Python SA-IS induced sorting in linear time",
+                lambda n: 160 * n)
+register_engine('numpy', prefix_doubling_suffix_array,
+                "Vectorised prefix doubling on NumPy arrays",
+                lambda n: 100 * n, requires='numpy')
+
+
+@instrumented('bwt_from_suffix_array')
+def bwt_from_suffix_array(string, positions):
+    """
+    This function derives the BWT encoded string from a string and its suffix array.
+    Every character of the BWT is the character preceding the start of the corresponding sorted rotation,
+    which is the last character of that rotation.
+    """
+    return ''.join(string[i - 1] for i in positions)
+
+
+def _bucket_heads(counts):
+    heads = []
+    total = 0
+    for count in counts:
+        heads.append(total)
+        total += count
+    return heads
+
+
+def _bucket_tails(counts):
+    tails = []
+    total = 0
+    for count in counts:
+        total += count
+        tails.append(total)
+    return tails
+
+
+def _induce(text, sa, s_type, counts):
+    # Induce the L-type suffixes from left to right, then the S-type suffixes from right to left
+    n = len(text)
+    heads = _bucket_heads(counts)
+    for i in range(n):
+        j = sa[i] - 1
+        if j >= 0 and not s_type[j]:
+            char = text[j]
+            sa[heads[char]] = j
+            heads[char] += 1
+    tails = _bucket_tails(counts)
+    for i in range(n - 1, -1, -1):
+        j = sa[i] - 1
+        if j >= 0 and s_type[j]:
+            char = text[j]
+            tails[char] -= 1
+            sa[tails[char]] = j
+
+
+def _sais(text, alphabet_size):
+    """
+    This function returns the suffix array of a list of integers in range(alphabet_size) whose last element
+    is a unique 0 sentinel, using the SA-IS induced sorting algorithm.
+    """
+    n = len(text)
+    if n == 1:
+        return [0]
+
+    # Classify every suffix as S-type (True) or L-type (False)
+    s_type = [False] * n
+    s_type[-1] = True
+    for i in range(n - 2, -1, -1):
+        s_type[i] = text[i] < text[i + 1] or (text[i] == text[i + 1] and s_type[i + 1])
+    is_lms = [False] * n
+    lms_positions = []
+    for i in range(1, n):
+        if s_type[i] and not s_type[i - 1]:
+            is_lms[i] = True
+            lms_positions.append(i)
+
+    counts = [0] * alphabet_size
+    for char in text:
+        counts[char] += 1
+
+    # Sort the LMS substrings by placing the LMS positions at their bucket tails and inducing
+    sa = [-1] * n
+    tails = _bucket_tails(counts)
+    for i in reversed(lms_positions):
+        char = text[i]
+        tails[char] -= 1
+        sa[tails[char]] = i
+    _induce(text, sa, s_type, counts)
+
+    # Name the LMS substrings, equal substrings sharing the same name
+    names = [-1] * n
+    name = 0
+    previous = -1
+    for i in sa:
+        if not is_lms[i]:
+            continue
+        if previous >= 0 and not _lms_substrings_equal(text, s_type, is_lms, previous, i):
+            name += 1
+        names[i] = name
+        previous = i
+    reduced = [names[i] for i in lms_positions]
+
+    # Sort the LMS suffixes, recursing only when two LMS substrings share a name
+    if name + 1 == len(reduced):
+        reduced_sa = [0] * len(reduced)
+        for index, reduced_name in enumerate(reduced):
+            reduced_sa[reduced_name] = index
+    else:
+        reduced_sa = _sais(reduced, name + 1)
+
+    # Place the sorted LMS suffixes and induce the final suffix array
+    sa = [-1] * n
+    tails = _bucket_tails(counts)
+    for index in reversed(reduced_sa):
+        i = lms_positions[index]
+        char = text[i]
+        tails[char] -= 1
+        sa[tails[char]] = i
+    _induce(text, sa, s_type, counts)
+    return sa
+
+
+def _lms_substrings_equal(text, s_type, is_lms, a, b):
+    n = len(text)
+    if a == n - 1 or b == n - 1:
+        return a == b
+    k = 0
+    while True:
+        if text[a + k] != text[b + k] or s_type[a + k] != s_type[b + k]:
+            return False
+        if k > 0 and is_lms[a + k]:
+            return is_lms[b + k]
+        k += 1
@@ -0,0 +1,223 @@
+# bwt_package/wavelet.py
+#-----------------------------------------------------------------#
+#Wavelet matrix over compact bitvectors
+#A sequence over any alphabet is stored as ceil(log2 sigma) bitvectors of n bits, one per bit of the
+#character codes, so rank, select and access cost O(log sigma) bitvector operations and the memory grows
+#with n log sigma instead of the sigma counters per checkpoint of a flat Occ table (protein and byte alphabets).
+#Every bitvector answers rank in O(1) from counts stored per superblock and per block.
+#-----------------------------------------------------------------#
+
+from array import array
+from bisect import bisect_right
+
+WORD_BITS = 64
+#Cumulative counts of set bits are stored every SUPERBLOCK_BITS bits, and relative to the superblock every BLOCK_BITS bits
+SUPERBLOCK_BITS = 2048
+BLOCK_BITS = 128
+
+# int.bit_count() appeared in Python 3.10
+_popcount = int.bit_count if hasattr(int, 'bit_count') else (lambda value: bin(value).count('1'))
+
+
+class BitVector:
+    """
+    This class is a static bitvector packed into 64-bit words, with rank and select support.
+    Superblocks of SUPERBLOCK_BITS bits store the number of set bits before them (64-bit counts) and blocks of
+    BLOCK_BITS bits the number of set bits since the start of their superblock (16-bit counts), so rank1() adds
+    two stored counts and the population count of at most two words: O(1) time for about 16% extra space.
+    select1() and select0() use a binary search over the superblocks, then scan one superblock.
+    """
+
+    def __init__(self, bits):
+        bits = bytes(bits)
+        self.n = len(bits)
+        # Packing the bits through one big integer, least significant bit first
+        value = int(bits[::-1].translate(bytes.maketrans(b'\x00\x01', b'01')), 2) if bits else 0
+        # At least one padding bit, so that rank1(n) can read the word and block that follow the last bit
+        padded = (self.n // BLOCK_BITS + 1) * BLOCK_BITS
+        self.words = array('Q')
+        self.words.frombytes(value.to_bytes(padded // 8, 'little'))
+        self.superblocks = array('Q')
+        self.blocks = array('H')
+        words_per_block = BLOCK_BITS // WORD_BITS
+        blocks_per_superblock = SUPERBLOCK_BITS // BLOCK_BITS
+        total = 0
+        for block in range(len(self.words) // words_per_block):
+            if block % blocks_per_superblock == 0:
+                self.superblocks.append(total)
+            self.blocks.append(total - self.superblocks[-1])
+            start = block * words_per_block
+            total += sum(_popcount(word) for word in self.words[start:start + words_per_block])
+        self.superblocks.append(total)
+        self.ones = total
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, position):
+        if not 0 <= position < self.n:
+            raise IndexError("BitVector index out of range")
+        return (self.words[position >> 6] >> (position & 63)) & 1
+
+    def rank1(self, position):
+        """
+        This function returns the number of set bits in the first position bits.
+        """
+        position = min(max(position, 0), self.n)
+        word = position >> 6
+        count = self.superblocks[position // SUPERBLOCK_BITS] + self.blocks[position // BLOCK_BITS]
+        if word & 1:
+            # Blocks hold two words; the first one is counted whole
+            count += _popcount(self.words[word - 1])
+        return count + _popcount(self.words[word] & ((1 << (position & 63)) - 1))
+
+    def rank0(self, position):
+        """
+        This function returns the number of unset bits in the first position bits.
+        """
+        position = min(max(position, 0), self.n)
+        return position - self.rank1(position)
+
+    def select1(self, k):
+        """
+        This function returns the position of the k-th set bit (0-based).
+        """
+        if not 0 <= k < self.ones:
+            raise IndexError("BitVector has fewer set bits")
+        superblock = bisect_right(self.superblocks, k) - 1
+        return self._scan(superblock, k - self.superblocks[superblock], 1)
+
+    def select0(self, k):
+        """
+        This function returns the position of the k-th unset bit (0-based).
+        """
+        if not 0 <= k < self.n - self.ones:
+            raise IndexError("BitVector has fewer unset bits")
+        # Binary search on the number of unset bits before every superblock
+        low, high = 0, len(self.superblocks) - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if middle * SUPERBLOCK_BITS - self.superblocks[middle] <= k:
+                low = middle
+            else:
+                high = middle - 1
+        return self._scan(low, k - (low * SUPERBLOCK_BITS - self.superblocks[low]), 0)
+
+    def _scan(self, superblock, k, bit):
+        # Position of the k-th bit equal to bit inside superblock, word by word and then bit by bit
+        word = superblock * SUPERBLOCK_BITS // WORD_BITS
+        while True:
+            value = self.words[word] if bit else ~self.words[word] & 0xFFFFFFFFFFFFFFFF
+            count = _popcount(value)
+            if k < count:
+                break
+            k -= count
+            word += 1
+        for offset in range(WORD_BITS):
+            if (value >> offset) & 1:
+                if k == 0:
+                    return word * WORD_BITS + offset
+                k -= 1
+
+    def memory_size(self):
+        """
+        This function returns the size in bytes of the packed bits and of the rank counts.
+        """
+        return sum(values.itemsize * len(values) for values in (self.words, self.superblocks, self.blocks))
+
+
+class WaveletMatrix:
+    """
+    This class stores a sequence (such as a BWT encoded string) over any alphabet in a wavelet matrix.
+    Every character gets a code of depth = ceil(log2 sigma) bits in alphabetical order. Level l holds the bit l
+    (most significant first) of the code of every position as a BitVector; the positions are then reordered
+    stably with the 0 bits first, and zeros[l] counts them. rank(), select() and access() take one bitvector
+    operation per level, and the characters themselves no longer need to be kept.
+    """
+
+    def __init__(self, sequence):
+        self.n = len(sequence)
+        self.alphabet = sorted(set(sequence))
+        self.codes = {char: code for code, char in enumerate(self.alphabet)}
+        self.depth = max(1, (len(self.alphabet) - 1).bit_length())
+        codes = [self.codes[char] for char in sequence]
+        self.levels = []
+        self.zeros = []
+        for level in range(self.depth):
+            shift = self.depth - 1 - level
+            bits = [(code >> shift) & 1 for code in codes]
+            bitvector = BitVector(bits)
+            self.levels.append(bitvector)
+            self.zeros.append(self.n - bitvector.ones)
+            codes = [code for code, bit in zip(codes, bits) if not bit] + [code for code, bit in zip(codes, bits) if bit]
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, position):
+        return self.access(position)
+
+    def access(self, position):
+        """
+        This function returns the character at position.
+        """
+        if not 0 <= position < self.n:
+            raise IndexError("WaveletMatrix index out of range")
+        code = 0
+        for bitvector, zeros in zip(self.levels, self.zeros):
+            bit = bitvector[position]
+            code = (code << 1) | bit
+            position = zeros + bitvector.rank1(position) if bit else bitvector.rank0(position)
+        return self.alphabet[code]
+
+    def rank(self, char, position):
+        """
+        This function returns the number of occurrences of char in the first position characters.
+        """
+        code = self.codes.get(char)
+        if code is None or position <= 0:
+            return 0
+        start, end = 0, min(position, self.n)
+        for level, (bitvector, zeros) in enumerate(zip(self.levels, self.zeros)):
+            if (code >> (self.depth - 1 - level)) & 1:
+                start, end = zeros + bitvector.rank1(start), zeros + bitvector.rank1(end)
+            else:
+                start, end = bitvector.rank0(start), bitvector.rank0(end)
+        return end - start
+
+    def select(self, char, k):
+        """
+        This function returns the position of the k-th occurrence (0-based) of char.
+        """
+        code = self.codes.get(char)
+        if code is None or k < 0:
+            raise IndexError(f"'{char}' does not occur {k + 1} times")
+        # Going down to where the occurrences of char start on the last level, then back up from the k-th one
+        start = 0
+        for level, (bitvector, zeros) in enumerate(zip(self.levels, self.zeros)):
+            if (code >> (self.depth - 1 - level)) & 1:
+                start = zeros + bitvector.rank1(start)
+            else:
+                start = bitvector.rank0(start)
+        position = start + k
+        for level in reversed(range(self.depth)):
+            bitvector, zeros = self.levels[level], self.zeros[level]
+            if (code >> (self.depth - 1 - level)) & 1:
+                position = bitvector.select1(position - zeros)
+            else:
+                position = bitvector.select0(position)
+        if position >= self.n or self.access(position) != char:
+            raise IndexError(f"'{char}' does not occur {k + 1} times")
+        return position
+
+    def memory_size(self):
+        """
+        This function returns the size in bytes of the bitvectors and of the level and alphabet tables.
+        """
+        return sum(bitvector.memory_size() for bitvector in self.levels) + 8 * len(self.zeros) + len(self.alphabet)
+
+    def bits_per_symbol(self):
+        """
+        This function returns the memory used per character of the sequence, in bits.
+        """
+        return 8 * self.memory_size() / self.n if self.n else 0.0
@@ -6,94 +6,18 @@
 #-----------------------------------------------------------------#
 
 import argparse
-import pandas as pd
-
-# Importing necessary libraries
-
-# Define the custom implementation of Burrows-Wheeler Transform ()
-def bwt(string):
-    """
-    This function takes a string as input and returns the Burrows-Wheeler Transform (BWT) of the string.
-    The BWT is obtained by cyclically permuting the string and sorting the permutations lexicographically.
-    The function returns a Pandas DataFrame matrix containing the possible rotations and their sorted forms,
-    and the BWT encoded string as its output.
-    """
-    string += '$'
-    indices = [string[i:] + string[:i] for i in range(len(string))]
-    sorted_indices = sorted(indices)
-    bwt_encoded = ''.join(sorted_indices[-1][-1] for sorted_indices in sorted_indices)
-    matrix = pd.DataFrame({
-        "Possible rotations": indices,
-        "Sorted": sorted_indices
-    })
-    return matrix, bwt_encoded
-
-# Define the inverse BWT function
-def bwt_inverse(bwt_encoded):
-    """
-    This function takes a BWT encoded string as input and returns the original string before BWT was applied.
-    It reconstructs the original string by iteratively following the indices of characters in the BWT encoded string.
-    The function returns a Pandas DataFrame df containing the first column and the original sequence column,
-    and the original string without the EOF character '$'.
-    """
-    if '$' not in bwt_encoded:
-        bwt_encoded += '$'
-    ln = len(bwt_encoded)
-    # Creating a list of tuples with each character and index followed by sorting
-    tuples = [(char, i) for i, char in enumerate(bwt_encoded)]
-    tuples.sort()
-    # Reconstructing the first column of Matrix
-    column_1 = [char for char, n in tuples]
-    # Initializing current BWT row to the row containing '$'
-    current_BWT_row = tuples[bwt_encoded.index('$')][1]
-    # Reconstructing the original string input by the user
-    string_original = ''
-    for n in range(ln):
-        string_original = column_1[current_BWT_row] + string_original
-        current_BWT_row = tuples[current_BWT_row][1]
-    sorted_indices = sorted(range(ln), key=lambda x: bwt_encoded[x])
-
-    current_index = sorted_indices[bwt_encoded.index('$')]
-    string_original = ''
-    for _ in range(ln - 1):
-        string_original += bwt_encoded[current_index]
-        current_index = sorted_indices[current_index]
-
-    df = pd.DataFrame({
-        "First Column": column_1,
-        "Original Sequence Column": list(bwt_encoded)
-    })
-    return df, string_original
-
-# Function to calculate the size of a string in bytes
-def calculate_size(input_string):
-    """
-    This function calculates the size of a string in bytes.
-    It encodes the string using the UTF-8 encoding and returns the size in bytes.
-    """
-    size_in_bytes = len(input_string.encode('utf-8'))
-    return size_in_bytes
-
-def measure_compression(input_sequence):
-    """
-    This function measures the compression rate of a given input sequence.
-    It applies the BWT to the input sequence, then applies the inverse BWT to obtain the original sequence.
-    It calculates the original size, compressed size, and compression rate (as a percentage)
-    and returns the measurements in a Pandas DataFrame.
-    """
-    _, bwt_encoded = bwt(input_sequence)
-    _, string_original = bwt_inverse(bwt_encoded)
-
-    original_size = len(input_sequence)
-    compressed_size = len(bwt_encoded)
-    compression_rate = compressed_size / original_size if original_size != 0 else 0
-
-    return pd.DataFrame({
-        'Sequence': [input_sequence],
-        'Original Sequence': [string_original],
-        'SequenceLength': [original_size],
-        'CompressionRate': [compression_rate * 100]  # Multiply by 100 to represent as percentage
-    })
+import os
+import sys
+from itertools import tee
+
+# Making the shared bwt_package importable when this script is run from the bwt_shell_MS folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bwt_package.fm_index import DEFAULT_OCC_SAMPLE_RATE, DEFAULT_SA_SAMPLE_RATE, RANK_BACKENDS, FMIndex
+from bwt_package.batch import bwt_inverse_many, bwt_many
+from bwt_package.collection import CollectionBWT
+from bwt_package.core import bwt, bwt_inverse, calculate_size, measure_compression
+from bwt_package.fastx import OUTPUT_FORMATS, open_text, read_fastx, write_record
+from bwt_package.suffix_array import engine_choices
 
 # Predefined options for strings
 strings_to_process = [
@@ -107,44 +31,130 @@ strings_to_process = [
     "ATATGTATACAT"
 ]
 
-parser = argparse.ArgumentParser(description='BWT Programming')
-
-parser.add_argument('--option', type=int, help='Choose an option: 1, 2, 3, 4, or 5')
-parser.add_argument('--sequence', type=str, help='Input sequence for BWT or compression measurement')
-parser.add_argument('--inverse_sequence', type=str, help='Input BWT inverse sequence for inverse BWT')
-parser.add_argument('--string_size', type=str, help='String for size calculation')
-parser.add_argument('--compression_sequence', type=str, help='Input sequence for compression measurement')
-
-args = parser.parse_args()
-
-if args.option == 1:
-    bwt_result, bwt_encoded = bwt(args.sequence)
-    print("\nBWT result of your entered sequence is: ", bwt_encoded)
-    user_input_2 = input("Do you want to see all the possible permutations sorted? ").strip().lower()
-    if user_input_2 in ["yes", "y"]:
-        print("\nHere are all the possible permutations and sorted form: ")
-        print(bwt_result)
-    print()
-
-elif args.option == 2:
-    inverse_result, string_original = bwt_inverse(args.inverse_sequence)
-    print("\nInverse BWT sequence is:", string_original)
-    print("\nVisualization:")
-    print(inverse_result)
-    print()
-
-elif args.option == 3:
-    size_in_bytes = calculate_size(args.string_size)
-    print(f"Size in bytes: {size_in_bytes}")
-
-elif args.option == 4:
-    compression_result = measure_compression(args.compression_sequence)
-    print("\nCompression Measurement:")
-    print(compression_result)
-    print()
-
-elif args.option == 5:
-    print("Exiting the program.")
-
-else:
-    print("Invalid option. Please enter a valid option.")
+# Function to stream a FASTA/FASTQ file record by record through the BWT
+def process_records(input_path, output, option, engine, output_format, workers=None):
+    """
+    This function reads the FASTA/FASTQ (optionally gzip-compressed) file at input_path one record at a time,
+    applies the BWT (option 1) or the inverse BWT (option 2) to each sequence and writes the results to output.
+    The sequences are transformed in chunks by a pool of workers processes (one per core by default) with
+    bwt_many()/bwt_inverse_many(), without building the matrix views, to keep the per-record overhead low.
+    It returns the number of records processed.
+    """
+    records = 0
+    with open_text(input_path) as handle:
+        # The record ids wait in the tee buffer while their sequences are in flight
+        id_records, sequence_records = tee(read_fastx(handle))
+        sequences = (sequence for _, sequence in sequence_records)
+        if option == 2:
+            results = bwt_inverse_many(sequences, workers=workers)
+        else:
+            results = bwt_many(sequences, engine, workers=workers)
+        for (record_id, _), result in zip(id_records, results):
+            write_record(output, record_id, result, output_format)
+            records += 1
+    return records
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='BWT Programming')
+
+    parser.add_argument('--option', type=int, help='Choose an option: 1, 2, 3, 4, 5, 6 (search for a pattern) or 7 (collection BWT of the --input reads)')
+    parser.add_argument('--sequence', type=str, help='Input sequence for BWT or compression measurement')
+    parser.add_argument('--inverse_sequence', type=str, help='Input BWT inverse sequence for inverse BWT')
+    parser.add_argument('--string_size', type=str, help='String for size calculation')
+    parser.add_argument('--compression_sequence', type=str, help='Input sequence for compression measurement')
+    parser.add_argument('--pattern', type=str, help='Pattern to search for in --sequence with option 6, or in the --input reads with option 7')
+    parser.add_argument('--occ_sample_rate', type=int, default=DEFAULT_OCC_SAMPLE_RATE, help='Sampling rate of the FM-index occurrence checkpoints')
+    parser.add_argument('--sa_sample_rate', type=int, default=DEFAULT_SA_SAMPLE_RATE, help='Sampling rate of the FM-index suffix array samples')
+    parser.add_argument('--rank_backend', type=str, default='checkpoints', choices=RANK_BACKENDS, help='Structure answering the FM-index rank queries: Occ checkpoints, or a wavelet matrix for large alphabets')
+    parser.add_argument('--index', type=str, help='Index file for option 6: saved after building from --sequence, loaded when --sequence is not given')
+    parser.add_argument('--input', type=str, help='FASTA/FASTQ file (optionally gzip-compressed) to transform record by record with option 1 or 2, or as one collection with option 7')
+    parser.add_argument('--output', type=str, help='Output file for --input (default: standard output)')
+    parser.add_argument('--ids', type=str, help='With option 7, file to write the row and read id of every terminator of the collection BWT to')
+    parser.add_argument('--output_format', type=str, default='fasta', choices=OUTPUT_FORMATS, help='Output format for --input')
+    parser.add_argument('--engine', type=str, default='auto', choices=engine_choices(), help='Suffix array engine used by the BWT')
+    parser.add_argument('--workers', type=int, default=None, help='Number of processes used for --input (default: number of cores)')
+
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.input and args.option in (1, 2):
+        output = open(args.output, 'w') if args.output else sys.stdout
+        try:
+            process_records(args.input, output, args.option, args.engine, args.output_format, args.workers)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+
+    elif args.option == 1:
+        bwt_result, bwt_encoded = bwt(args.sequence, args.engine)
+        print("\nBWT result of your entered sequence is: ", bwt_encoded)
+        user_input_2 = input("Do you want to see all the possible permutations sorted? ").strip().lower()
+        if user_input_2 in ["yes", "y"]:
+            print("\nHere are all the possible permutations and sorted form: ")
+            print(bwt_result)
+        print()
+
+    elif args.option == 2:
+        inverse_result, string_original = bwt_inverse(args.inverse_sequence)
+        print("\nInverse BWT sequence is:", string_original)
+        print("\nVisualization:")
+        print(inverse_result)
+        print()
+
+    elif args.option == 3:
+        size_in_bytes = calculate_size(args.string_size)
+        print(f"Size in bytes: {size_in_bytes}")
+
+    elif args.option == 4:
+        compression_result = measure_compression(args.compression_sequence)
+        print("\nCompression Measurement:")
+        print(compression_result)
+        print()
+
+    elif args.option == 5:
+        print("Exiting the program.")
+
+    elif args.option == 6:
+        if args.index and args.sequence is None:
+            # Mapping a saved index instead of rebuilding it
+            fm_index = FMIndex.load(args.index)
+        else:
+            fm_index = FMIndex.from_string(args.sequence, args.engine, args.occ_sample_rate, args.sa_sample_rate,
+                                           args.rank_backend)
+            if args.index:
+                fm_index.save(args.index)
+        memory = fm_index.memory_size()
+        print(f"\nIndex memory ({fm_index.rank_backend}): {memory} bytes ({8 * memory / len(fm_index):.2f} bits per symbol)")
+        print(f"\nOccurrences of {args.pattern}: {fm_index.count(args.pattern)}")
+        print(f"Positions (0-based): {fm_index.locate(args.pattern)}")
+        print()
+        # Unmapping the index file when it was loaded
+        fm_index.close()
+
+    elif args.option == 7:
+        with open_text(args.input) as handle:
+            collection = CollectionBWT.from_records(read_fastx(handle), args.occ_sample_rate, args.rank_backend)
+        output = open(args.output, 'w') if args.output else sys.stdout
+        try:
+            write_record(output, 'collection_bwt', collection.bwt_encoded, args.output_format)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        if args.ids:
+            # Mapping the terminator rows of the BWT back to the reads they end
+            with open(args.ids, 'w') as handle:
+                for row, record_id in collection.terminator_rows():
+                    handle.write(f"{row}\t{record_id}\n")
+        if args.pattern:
+            print(f"\nOccurrences of {args.pattern}: {collection.count(args.pattern)}")
+            print(f"Reads and offsets (0-based): {collection.locate(args.pattern)}")
+            print()
+
+    else:
+        print("Invalid option. Please enter a valid option.")
+
+# The worker processes of --input re-import this file under the spawn start method (macOS, Windows),
+# so the command line is only run from the main process
+if __name__ == "__main__":
+    main()
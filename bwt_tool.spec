@@ -6,7 +6,8 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    # pandas and NumPy are imported lazily through importlib (bwt_package/lazy.py), out of sight of the analysis
+    hiddenimports=['pandas', 'numpy'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
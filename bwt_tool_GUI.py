@@ -1,96 +1,27 @@
+import multiprocessing
 import tkinter as tk
-from tkinter import simpledialog, messagebox
-import pandas as pd
+from tkinter import simpledialog, messagebox, ttk
+from bwt_package.background import BackgroundTask
+from bwt_package.core import bwt, bwt_inverse, calculate_size
+from bwt_package.core import measure_compression as measure_compression_table
+from bwt_package.matrix_table import MatrixTable
 
-#Define the custom implementation of Burrows-Wheeler Transform ()
-def bwt(string):
-    """
-    This function takes a string as input and returns the Burrows-Wheeler Transform (BWT) of the string.
-    The BWT is obtained by cyclically permuting the string and sorting the permutations lexicographically.
-    The function returns a Pandas DataFrame matrix containing the possible rotations and their sorted forms,
-    and the BWT encoded string as its output.
-    """
-    string += '$'
-    indices = [string[i:] + string[:i] for i in range(len(string))]
-    sorted_indices = sorted(indices)
-    bwt_encoded = ''.join(sorted_indices[-1][-1] for sorted_indices in sorted_indices)
-    matrix = pd.DataFrame({
-        "Possible rotations": indices,
-        "Sorted": sorted_indices
-    })
-    return matrix, bwt_encoded
-
-#Define the inverse BWT function
-def bwt_inverse(bwt_encoded):
-    """
-    This function takes a BWT encoded string as input and returns the original string before BWT was applied.
-    It reconstructs the original string by iteratively following the indices of characters in the BWT encoded string.
-    The function returns a Pandas DataFrame df containing the first column and the original sequence column,
-    and the original string without the EOF character '$'.
-    """
-    if '$' not in bwt_encoded:
-        bwt_encoded += '$'
-    ln = len(bwt_encoded)
-    # Creating a list of tuples with each character and index followed by sorting
-    tuples = [(char, i) for i, char in enumerate(bwt_encoded)]
-    tuples.sort()
-    # Reconstructing the first column of Matrix
-    column_1 = [char for char, n in tuples]
-    # Initializing current BWT row to the row containing '$'
-    current_BWT_row = tuples[bwt_encoded.index('$')][1]
-    # Reconstructing the original string input by the user
-    string_original = ''
-    for n in range(ln):
-        string_original = column_1[current_BWT_row] + string_original
-        current_BWT_row = tuples[current_BWT_row][1]
-    sorted_indices = sorted(range(ln), key=lambda x: bwt_encoded[x])
-
-    current_index = sorted_indices[bwt_encoded.index('$')]
-    string_original = ''
-    for _ in range(ln - 1):
-        string_original += bwt_encoded[current_index]
-        current_index = sorted_indices[current_index]
-
-    df = pd.DataFrame({
-        "First Column": column_1,
-        "Original Sequence Column": list(bwt_encoded)
-    })
-    return df, string_original
-
-#Function to calculate the size of a string in bytes
-def calculate_size(input_string):
-    """
-    This function calculates the size of a string in bytes.
-    It encodes the string using the UTF-8 encoding and returns the size in bytes.
-    """
-    size_in_bytes = len(input_string.encode('utf-8'))
-    return size_in_bytes
 
 def measure_compression(input_sequence):
     """
-    This function measures the compression rate of a given input sequence.
-    It applies the BWT to the input sequence, then applies the inverse BWT to obtain the original sequence.
-    It calculates the original size, compressed size, and compression rate (as a percentage)
-    and returns the measurements in a Pandas DataFrame.
+    This function measures the compression of a given input sequence with bwt_package.core.measure_compression()
+    and replaces its compression rate by the space saved, shown as the modulus of the percentage in 'CompressionRate%'.
     """
-    _, bwt_encoded = bwt(input_sequence)
-    _, string_original = bwt_inverse(bwt_encoded)
+    result = measure_compression_table(input_sequence)
+    original_size = result.at[0, 'OriginalBytes']
+    compressed_size = result.at[0, 'CompressedBytes']
 
-    original_size = len(input_sequence)
-    compressed_size = len(bwt_encoded)
-    
     # Calculate the compression rate
     compression_rate = (original_size - compressed_size) / original_size if original_size != 0 else 0
-    
-    # Calculate the modulus of the compression rate percentage
-    compression_rate_modulus = abs(compression_rate * 100)
 
-    return pd.DataFrame({
-        'Sequence': [input_sequence],
-        'Original Sequence': [string_original],
-        'SequenceLength': [original_size],
-        'CompressionRate%': [compression_rate_modulus]  # Use the modulus value
-    })
+    # Calculate the modulus of the compression rate percentage
+    result.insert(result.columns.get_loc('CompressionRate'), 'CompressionRate%', [abs(compression_rate * 100)])
+    return result.drop(columns='CompressionRate')
 
 
 #Predefined options for strings
@@ -105,6 +36,11 @@ strings_to_process = [
     "ATATGTATACAT"
 ]
 
+#Inputs shorter than this are processed directly; longer ones in a worker process
+BACKGROUND_THRESHOLD = 10000
+#How often the worker process is polled, in milliseconds
+POLL_INTERVAL_MS = 50
+
 class BWTToolGUI:
     def __init__(self, master):
         self.master = master
@@ -121,49 +57,118 @@ class BWTToolGUI:
             "Exit"
         ]
 
+        self.buttons = []
         for i, option in enumerate(self.options, start=1):
             button = tk.Button(master, text=f"{i}. {option}", command=lambda opt=option: self.handle_option(opt))
             button.pack()
+            self.buttons.append(button)
+
+        # Progress of the operation running in the background
+        self.status_label = tk.Label(master, text="")
+        self.status_label.pack()
+        self.progress = ttk.Progressbar(master, mode='indeterminate', length=250)
+        self.progress.pack()
+        self.cancel_button = tk.Button(master, text="Cancel", command=self.cancel_task, state=tk.DISABLED)
+        self.cancel_button.pack()
+        self.task = None
+        self.task_name = None
+        self.on_task_done = None
 
     def handle_option(self, option):
         if option == "Exit":
+            self.cancel_task()
             self.master.destroy()
         elif option == "Perform Burrows-Wheeler Transform":
             user_input = simpledialog.askstring("Input", "Please enter the sequence:")
+            if user_input is None:
+                return
             show_rotations = messagebox.askyesno("Show Rotations", "Do you want to see all the possible permutations sorted?")
-            bwt_result, bwt_encoded = bwt(user_input)
-            self.show_bwt_results(user_input, bwt_encoded, show_rotations)
+            self.run_task("Burrows-Wheeler Transform", bwt, user_input,
+                          lambda bwt_result: self.show_bwt_results(user_input, bwt_result, show_rotations))
         elif option == "Inverse Burrows-Wheeler Transform":
             user_input_inverse = simpledialog.askstring("Input", "Please enter the BWT Inverse sequence:")
-            self.show_inverse_bwt_results(user_input_inverse)
+            if user_input_inverse is None:
+                return
+            self.run_task("Inverse Burrows-Wheeler Transform", bwt_inverse, user_input_inverse, self.show_inverse_bwt_results)
         elif option == "Calculate size of a string":
             self.calculate_size_option()
         elif option == "Measure Compression":
             user_input = simpledialog.askstring("Input", "Please enter the sequence for compression measurement:")
-            self.show_compression_results(user_input)
-
-    def show_bwt_results(self, user_input, bwt_encoded, show_rotations):
-        result, _ = bwt(user_input)
+            if user_input is None:
+                return
+            self.run_task("Measure Compression", measure_compression, user_input, self.show_compression_results)
+
+    def run_task(self, name, function, user_input, on_done):
+        """
+        This function calls function(user_input) and passes its result to on_done. Long inputs are processed
+        in a worker process polled with after(), so the window stays responsive and the task can be cancelled.
+        """
+        if len(user_input) < BACKGROUND_THRESHOLD:
+            on_done(function(user_input))
+            return
+        self.task = BackgroundTask(function, user_input)
+        self.task_name = name
+        self.on_task_done = on_done
+        for button in self.buttons[:-1]:
+            button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.status_label.config(text=f"{name} running on {len(user_input)} characters...")
+        self.progress.start(10)
+        self.master.after(POLL_INTERVAL_MS, self.poll_task)
+
+    def poll_task(self):
+        task = self.task
+        if task is None:
+            return
+        if not task.poll():
+            if task.phase:
+                self.status_label.config(text=f"{self.task_name} running... (finished {task.phase})")
+            self.master.after(POLL_INTERVAL_MS, self.poll_task)
+            return
+        on_done = self.on_task_done
+        self.finish_task(f"{self.task_name} finished")
+        if task.status == 'done':
+            on_done(task.result)
+        elif task.status == 'error':
+            messagebox.showerror("Error", task.error)
+
+    def cancel_task(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.finish_task(f"{self.task_name} cancelled")
+
+    def finish_task(self, status):
+        self.progress.stop()
+        self.status_label.config(text=status)
+        for button in self.buttons:
+            button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+        self.task = None
+        self.on_task_done = None
+
+    def show_bwt_results(self, user_input, bwt_result, show_rotations):
+        result, bwt_encoded = bwt_result
         if show_rotations:
+            # Only the visible rows of the matrix are built, as the table is scrolled
             rotations_window = tk.Toplevel(self.master)
-            rotations_text = tk.Text(rotations_window)
-            rotations_text.insert(tk.END, str(result))
-            rotations_text.pack()
+            rotations_window.title("Rotations")
+            rotations_table = MatrixTable(rotations_window, result)
+            rotations_table.pack(fill=tk.BOTH, expand=True)
 
         bwt_window = tk.Toplevel(self.master)
         bwt_label = tk.Label(bwt_window, text=f"BWT result of your entered sequence is: {bwt_encoded}")
         bwt_label.pack()
 
-    def show_inverse_bwt_results(self, user_input_inverse):
-        inverse_result, string_original = bwt_inverse(user_input_inverse)
+    def show_inverse_bwt_results(self, inverse_bwt_result):
+        inverse_result, string_original = inverse_bwt_result
         inverse_window = tk.Toplevel(self.master)
         inverse_label = tk.Label(inverse_window, text=f"Inverse BWT sequence is: {string_original}")
         inverse_label.pack()
 
         visualization_window = tk.Toplevel(self.master)
-        visualization_text = tk.Text(visualization_window)
-        visualization_text.insert(tk.END, str(inverse_result))
-        visualization_text.pack()
+        visualization_window.title("Visualization")
+        visualization_table = MatrixTable(visualization_window, inverse_result)
+        visualization_table.pack(fill=tk.BOTH, expand=True)
 
     def calculate_size_option(self):
         size_option = simpledialog.askstring("Calculate Size", "Choose an option for string size calculation:\n1. Enter a custom string\n2. Use a predefined sequence")
@@ -181,13 +186,15 @@ class BWTToolGUI:
         size_in_bytes = calculate_size(input_string)
         messagebox.showinfo("Size in Bytes", f"Size in bytes: {size_in_bytes}")
 
-    def show_compression_results(self, user_input):
-        compression_result = measure_compression(user_input)
+    def show_compression_results(self, compression_result):
         compression_window = tk.Toplevel(self.master)
         compression_label = tk.Label(compression_window, text=f"Compression Measurement:\n{compression_result}")
         compression_label.pack()
 
 # Tkinter GUI setup
-root = tk.Tk()
-app = BWTToolGUI(root)
-root.mainloop()
+# The guard keeps worker processes from opening a window of their own when they import this script
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    root = tk.Tk()
+    app = BWTToolGUI(root)
+    root.mainloop()
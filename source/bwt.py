@@ -3,76 +3,53 @@
 
 
 # Importing libraries required
+import os
+import sys
 import time
-import pandas as pd
-import matplotlib.pyplot as plt
-
-
-# Define the Burrows-Wheeler Transform function
-def bwt(string):
-    string += '$'
-    indices = [string[i:] + string[:i] for i in range(len(string))]
-    sorted_indices = sorted(indices)
-    bwt_encoded = ''.join(sorted_indices[-1][-1] for sorted_indices in sorted_indices)
-    matrix = pd.DataFrame({
-        "Possible rotations": indices,
-        "Sorted": sorted_indices
-    })
-    return matrix, bwt_encoded
-
-
-# Define the inverse BWT function
-def bwt_inverse(bwt_encoded):
-    if '$' not in bwt_encoded:
-        bwt_encoded += '$'
-    ln = len(bwt_encoded)
-    # Creating a list of tuples with each character and index followed by sorting
-    tuples = [(char, i) for i, char in enumerate(bwt_encoded)]
-    tuples.sort()
-    # Reconstructing the first column of Matrix
-    column_1 = [char for char, n in tuples]
-    # Initializing current BWT row to the row containing '$'
-    current_BWT_row = tuples[bwt_encoded.index('$')][1]
-    # Reconstructing the original string input by the user
-    string_original = ''
-    for n in range(ln):
-        string_original = column_1[current_BWT_row] + string_original
-        current_BWT_row = tuples[current_BWT_row][1]
-    sorted_indices = sorted(range(ln), key=lambda x: bwt_encoded[x])
-
-    current_index = sorted_indices[bwt_encoded.index('$')]
-    string_original = ''
-    for _ in range(ln - 1):
-        string_original += bwt_encoded[current_index]
-        current_index = sorted_indices[current_index]
-
-    df = pd.DataFrame({
-        "First Column": column_1,
-        "Original Sequence Column": list(bwt_encoded)
-    })
-    return df, string_original
+
+# Making the shared bwt_package importable when this script is run from the source folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bwt_package.codec import compress_with_stats, decompress, throughput
+from bwt_package.core import bwt, bwt_inverse
+from bwt_package.instrumentation import instrumented
+from bwt_package.lazy import lazy_import
+from bwt_package.run_length import count_runs
+
+# pandas and matplotlib are only imported when a DataFrame or a plot is built, which keeps start-up fast
+pd = lazy_import('pandas')
+plt = lazy_import('matplotlib.pyplot')
 
 
+@instrumented('measure_compression')
 def measure_compression(input_sequence):
-    start_time_compress = time.time()
-    _, bwt_encoded = bwt(input_sequence)
-    compression_time = time.time() - start_time_compress
+    original = input_sequence.encode('utf-8')
+    compressed, stage_times = compress_with_stats(original)
+    compression_time = sum(stage_times.values())
 
-    start_time_decompress = time.time()
-    _, _ = bwt_inverse(bwt_encoded)
-    decompression_time = time.time() - start_time_decompress
+    start_time_decompress = time.perf_counter()
+    _ = decompress(compressed)
+    decompression_time = time.perf_counter() - start_time_decompress
 
-    original_size = len(input_sequence)
-    compressed_size = len(bwt_encoded)
+    original_size = len(original)
+    compressed_size = len(compressed)
     compression_rate = compressed_size / original_size if original_size != 0 else 0
+    bwt_encoded = bwt(input_sequence)[1]
+    runs = count_runs(bwt_encoded)
 
-    return pd.DataFrame({
+    result = pd.DataFrame({
         'Sequence': [input_sequence],
-        'SequenceLength': [original_size],
+        'SequenceLength': [len(input_sequence)],
+        'CompressedBytes': [compressed_size],
         'CompressionTime': [compression_time],
         'DecompressionTime': [decompression_time],
-        'CompressionRate': [compression_rate * 100]  # Multiply by 100 to represent as percentage
+        'CompressionRate': [compression_rate * 100],  # Multiply by 100 to represent as percentage
+        'BWTRuns': [runs],
+        'RunsRatio': [runs / len(bwt_encoded)]  # r/n
     })
+    # Throughput of every stage of the pipeline, in MB of input per second
+    for stage, seconds in stage_times.items():
+        result[f'{stage} MB/s'] = [throughput(original_size, seconds)]
+    return result
 
 
 while True:
@@ -0,0 +1,88 @@
+# tests/helpers.py
+#-----------------------------------------------------------------#
+#Reference implementations and inputs shared by the test modules
+#The references follow the textbook definitions (sorted rotations, a str.find scan) and never call the
+#package, so every structure is checked against something it does not share code with.
+#-----------------------------------------------------------------#
+
+from itertools import product
+
+#The predefined sequences of the command-line tools
+STRINGS_TO_PROCESS = [
+    "GATTACA",
+    "ATTACATTAC",
+    "ATATATATATA",
+    "ATATATATAT",
+    "AATAATAATAAT",
+    "AAAATAAATAAA",
+    "ATATACACACA",
+    "ATATGTATACAT"
+]
+PROTEIN = 'ACDEFGHIKLMNPQRSTVWY'
+
+
+def naive_bwt(string):
+    """
+    This function returns the BWT encoded string of string + '$' from its definition: the last column of the
+    sorted cyclic rotations, as bwt() computed it before the suffix array engines.
+    """
+    string += '$'
+    return ''.join(rotation[-1] for rotation in sorted(string[i:] + string[:i] for i in range(len(string))))
+
+
+def find_all(string, pattern):
+    """
+    This function returns every position of pattern in string, overlapping occurrences included.
+    """
+    positions = []
+    position = string.find(pattern)
+    while position != -1:
+        positions.append(position)
+        position = string.find(pattern, position + 1)
+    return positions
+
+
+def all_strings(alphabet, max_length):
+    """
+    This function yields every string over alphabet of up to max_length characters, the empty string included.
+    """
+    for length in range(max_length + 1):
+        for chars in product(alphabet, repeat=length):
+            yield ''.join(chars)
+
+
+def random_strings(rng, alphabets=('AC', 'ACGT', PROTEIN), lengths=(2, 17, 200)):
+    """
+    This function returns the predefined sequences followed by one random string per alphabet and length.
+    """
+    strings = list(STRINGS_TO_PROCESS)
+    for alphabet in alphabets:
+        for length in lengths:
+            strings.append(''.join(rng.choice(alphabet) for _ in range(length)))
+    return strings
+
+
+def repetitive_strings(rng, units=('A', 'AT', 'ACG', 'GATTACA'), length=60, mutations=3):
+    """
+    This function returns strings made of a repeated unit with a few random substitutions, whose BWT has few runs.
+    """
+    strings = []
+    for unit in units:
+        string = list(unit * (length // len(unit)))
+        for _ in range(mutations):
+            string[rng.randrange(len(string))] = rng.choice('ACGT')
+        strings.append(''.join(string))
+    return strings
+
+
+def patterns_of(string, rng, count=30):
+    """
+    This function returns patterns to search for in string: substrings of it, which occur at least once,
+    random DNA patterns, which mostly do not, a character absent from every alphabet and the whole string.
+    """
+    patterns = ['Z', string]
+    for _ in range(count):
+        start = rng.randrange(len(string))
+        patterns.append(string[start:start + rng.randint(1, 4)])
+        patterns.append(''.join(rng.choice('ACGT') for _ in range(rng.randint(1, 3))))
+    return patterns
@@ -0,0 +1,43 @@
+# tests/test_bwt.py
+#-----------------------------------------------------------------#
+#bwt() checked for every suffix array engine against the sorted-rotation transform it replaced, on the
+#predefined sequences, random strings and strings already containing the terminator '$',
+#and bwt_inverse() checked to give back the string bwt() was given.
+#-----------------------------------------------------------------#
+
+import random
+
+import pytest
+
+from bwt_package.core import bwt, bwt_inverse
+from bwt_package.suffix_array import engine_choices
+from helpers import STRINGS_TO_PROCESS, naive_bwt, random_strings
+
+
+def strings_with_terminator(rng):
+    # A repeated terminator makes every engine compare whole rotations instead of suffixes
+    strings = ["$", "A$", "$$A", "AC$GT", "GAT$TACA$", "$GATTACA"]
+    for length in (5, 40, 600):
+        strings.append(''.join(rng.choice('AC$G') for _ in range(length)))
+    return strings
+
+
+@pytest.mark.parametrize('engine', engine_choices())
+def test_bwt_matches_sorted_rotations(engine):
+    rng = random.Random(1)
+    for string in random_strings(rng) + strings_with_terminator(rng) + ['', 'A', 'ACGT' * 200]:
+        assert bwt(string, engine)[1] == naive_bwt(string), (engine, string)
+
+
+@pytest.mark.parametrize('engine', engine_choices())
+def test_rotation_matrix_is_sorted(engine):
+    for string in STRINGS_TO_PROCESS:
+        matrix = bwt(string, engine)[0].to_frame()
+        rotations = list(matrix['Sorted'])
+        assert rotations == sorted(rotations), (engine, string)
+
+
+def test_inverse_gives_back_string():
+    rng = random.Random(3)
+    for string in random_strings(rng) + ['A', 'ACGT' * 200]:
+        assert bwt_inverse(bwt(string)[1])[1] == string, string
@@ -0,0 +1,42 @@
+# tests/test_cache.py
+#-----------------------------------------------------------------#
+#Cache keys of str and PackedDNA inputs and of the other arguments of a call, and the size accounted
+#for a cached RotationMatrix checked against the size it reaches once displayed.
+#-----------------------------------------------------------------#
+
+import inspect
+
+from bwt_package.cache import LRUCache, cached, input_key
+from bwt_package.core import bwt
+from bwt_package.dna import PackedDNA
+
+
+def test_packed_dna_key_follows_sequence():
+    sequence = "ACGTNNNNacgtRYACGT" * 10
+    assert input_key('bwt', PackedDNA(sequence)) == input_key('bwt', PackedDNA(sequence[:90]) + sequence[90:])
+    assert input_key('bwt', PackedDNA(sequence)) != input_key('bwt', PackedDNA(sequence.upper()))
+    assert input_key('bwt', PackedDNA("ACGTN")) != input_key('bwt', PackedDNA("ACGTA"))
+    assert input_key('bwt', PackedDNA("ACGT")) != input_key('bwt', "ACGT")
+
+
+def test_other_arguments_are_part_of_the_key():
+    cache = LRUCache()
+    transform = cached('bwt', cache)(inspect.unwrap(bwt))
+    sort_matrix, sort_encoded = transform("GATTACA" * 30, 'sort')
+    numpy_matrix, numpy_encoded = transform("GATTACA" * 30, engine='numpy')
+    assert sort_encoded == numpy_encoded
+    assert sort_matrix is not numpy_matrix
+    assert transform("GATTACA" * 30, 'sort')[0] is sort_matrix
+    assert cache.stats()['entries'] == 2
+
+
+def test_rotation_matrix_size_does_not_grow():
+    cache = LRUCache()
+    transform = cached('bwt', cache)(inspect.unwrap(bwt))
+    for engine in ['sort', 'numpy']:
+        matrix = transform("ATATGTATACAT" * 50, engine)[0]
+        size = matrix.nbytes
+        matrix.sorted_position(0)
+        assert matrix._ranks is not None
+        assert matrix.nbytes == size
+    assert cache.current_bytes == sum(size for _, size in cache._entries.values())
@@ -0,0 +1,66 @@
+# tests/test_codec.py
+#-----------------------------------------------------------------#
+#decompress(compress(data)) checked to give back data for several block sizes, empty input, single-symbol
+#blocks and every byte value, and the Huffman code length table checked to round-trip, long codes included.
+#-----------------------------------------------------------------#
+
+import random
+
+import pytest
+
+from bwt_package.codec import (ALPHABET_SIZE, compress, decode_code_lengths, decompress, encode_code_lengths,
+                               huffman_decode, huffman_encode)
+
+
+def sample_inputs(rng):
+    return [
+        b'',
+        b'A',
+        b'A' * 1000,
+        b'\x00' * 300,
+        bytes(range(256)),
+        bytes(range(256)) * 5,
+        b'$GATTACA$' * 40,
+        bytes(rng.randrange(256) for _ in range(2000)),
+        bytes(rng.choice(b'ACGT') for _ in range(3000)),
+    ]
+
+
+@pytest.mark.parametrize('block_size', [1, 7, 256, 1000, 900000])
+def test_decompress_gives_back_input(block_size):
+    rng = random.Random(9)
+    for data in sample_inputs(rng):
+        assert decompress(compress(data, block_size=block_size)) == data, (block_size, data[:20])
+
+
+@pytest.mark.parametrize('engine', ['sais', 'numpy'])
+def test_engines_compress_alike(engine):
+    data = b'ACGTTGCAAGGCT' * 100
+    assert compress(data, block_size=300, engine=engine) == compress(data, block_size=300)
+    assert decompress(compress(data, block_size=300, engine=engine)) == data
+
+
+def test_code_lengths_round_trip():
+    rng = random.Random(90)
+    tables = [[0] * ALPHABET_SIZE, [1] + [0] * (ALPHABET_SIZE - 1), [0] * (ALPHABET_SIZE - 1) + [1]]
+    for _ in range(50):
+        tables.append([rng.choice([0, 0, rng.randint(1, 20)]) for _ in range(ALPHABET_SIZE)])
+    # First lengths above the 5-bit start, and lengths of up to ALPHABET_SIZE - 1 bits
+    tables.append([40, 31, 32, 1] + [0] * (ALPHABET_SIZE - 4))
+    tables.append(list(range(1, ALPHABET_SIZE)) + [ALPHABET_SIZE - 1])
+    for lengths in tables:
+        encoded = encode_code_lengths(lengths)
+        assert decode_code_lengths(b'\xff' + encoded + b'\xff', 1) == (lengths, len(encoded) + 1)
+
+
+def test_long_codes_round_trip():
+    # Code lengths 1, 2, ..., 39, 40, 40 form a complete prefix code with codes longer than 31 bits
+    lengths = list(range(1, 41)) + [40] + [0] * (ALPHABET_SIZE - 41)
+    symbols = list(range(41)) * 3
+    lengths_read, _ = decode_code_lengths(encode_code_lengths(lengths))
+    assert huffman_decode(huffman_encode(symbols, lengths), lengths_read, len(symbols)) == symbols
+
+
+def test_negative_code_length_rejected():
+    with pytest.raises(ValueError):
+        encode_code_lengths([2, -1] + [0] * (ALPHABET_SIZE - 2))
@@ -0,0 +1,76 @@
+# tests/test_collection.py
+#-----------------------------------------------------------------#
+#bcr_bwt() checked against the extended BWT sorted from its definition (terminators as '$', ordered by read
+#number) and CollectionBWT count()/locate() against a str.find scan of every read.
+#-----------------------------------------------------------------#
+
+import random
+
+import pytest
+
+from bwt_package.collection import CollectionBWT, bcr_bwt
+from bwt_package.core import bwt
+from helpers import find_all
+
+
+def naive_collection_bwt(sequences):
+    """
+    This function returns the extended BWT of sequences by sorting every suffix of every read followed by
+    its terminator, the terminator of read i sorting as '$' and before the terminators of the following reads.
+    """
+    suffixes = []
+    for read, sequence in enumerate(sequences):
+        for start in range(len(sequence) + 1):
+            key = tuple((char, -1) for char in sequence[start:]) + (('$', read),)
+            suffixes.append((key, sequence[start - 1] if start else '$'))
+    return ''.join(char for _, char in sorted(suffixes))
+
+
+def random_collections(rng):
+    collections = [["GATTACA"], ["A", "A"], ["AC", "CA", "ACA"], ["ATATATAT", "TATA", "ATAT"]]
+    for alphabet in ['AC', 'ACGT', 'ACGT#!z']:
+        for _ in range(15):
+            collections.append([''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 12)))
+                                for _ in range(rng.randint(1, 8))])
+    return collections
+
+
+def test_bcr_matches_sorted_suffixes():
+    rng = random.Random(23)
+    for sequences in random_collections(rng):
+        assert bcr_bwt(sequences) == naive_collection_bwt(sequences), sequences
+
+
+def test_single_sequence_matches_bwt():
+    rng = random.Random(230)
+    for length in range(1, 40):
+        sequence = ''.join(rng.choice('ACGT') for _ in range(length))
+        assert bcr_bwt([sequence]) == bwt(sequence)[1]
+
+
+def test_sequences_with_terminator_rejected():
+    with pytest.raises(ValueError):
+        bcr_bwt(["AC$GT"])
+
+
+@pytest.mark.parametrize('rank_backend', ['checkpoints', 'wavelet'])
+def test_count_and_locate_match_find(rank_backend):
+    rng = random.Random(231)
+    for sequences in random_collections(rng):
+        collection = CollectionBWT.from_sequences(sequences, occ_sample_rate=3, rank_backend=rank_backend)
+        patterns = {sequence[start:start + length] for sequence in sequences
+                    for start in range(len(sequence)) for length in (1, 2, 3)}
+        patterns.update(['GG', 'Q'])
+        for pattern in patterns:
+            expected = [(str(read), offset) for read, sequence in enumerate(sequences)
+                        for offset in find_all(sequence, pattern)]
+            assert collection.count(pattern) == len(expected), (sequences, pattern)
+            assert collection.locate(pattern) == expected, (sequences, pattern)
+
+
+def test_terminator_rows_map_back_to_reads():
+    sequences = ["GATTACA", "TACA", "GATT", "CAT"]
+    collection = CollectionBWT.from_records(zip(['r1', 'r2', 'r3', 'r4'], sequences))
+    for row, record_id in collection.terminator_rows():
+        read, offset = collection.read_of_row(row)
+        assert (collection.ids[read], offset) == (record_id, 0)
@@ -0,0 +1,88 @@
+# tests/test_dynamic_bwt.py
+#-----------------------------------------------------------------#
+#DynamicBWT append() and prepend() checked against the BWT of the whole string, exhaustively for short strings
+#(every row move of the four-stage update is exercised) and on random repetitive strings with small blocks.
+#-----------------------------------------------------------------#
+
+import random
+
+import pytest
+
+from bwt_package.core import bwt
+from bwt_package.dynamic_bwt import DynamicBWT, DynamicSequence
+from helpers import all_strings, find_all, naive_bwt
+
+
+@pytest.mark.parametrize('alphabet, max_length', [('ACGT', 7), ('AC', 10)])
+def test_append_one_character_matches_bwt(alphabet, max_length):
+    # Every string, grown by one character at its end from the BWT of its prefix
+    for string in all_strings(alphabet, max_length - 1):
+        for char in alphabet:
+            dynamic = DynamicBWT(string)
+            dynamic.append(char)
+            assert dynamic.bwt_encoded == naive_bwt(string + char), (string, char)
+
+
+@pytest.mark.parametrize('alphabet, max_length', [('ACGT', 7), ('AC', 10)])
+def test_prepend_one_character_matches_bwt(alphabet, max_length):
+    for string in all_strings(alphabet, max_length - 1):
+        for char in alphabet:
+            dynamic = DynamicBWT(string)
+            dynamic.prepend(char)
+            assert dynamic.bwt_encoded == naive_bwt(char + string), (char, string)
+
+
+def test_grown_from_empty_matches_bwt():
+    for string in all_strings('ACGT', 5):
+        appended = DynamicBWT()
+        appended.append(string)
+        prepended = DynamicBWT()
+        prepended.prepend(string)
+        assert appended.bwt_encoded == prepended.bwt_encoded == naive_bwt(string), string
+
+
+def test_random_updates_with_small_blocks():
+    # Block size 2 splits and merges blocks of the dynamic sequence on almost every update
+    rng = random.Random(22)
+    for unit in ['AT', 'ACGT', 'AAC', 'GATTACA']:
+        string = unit * 3
+        dynamic = DynamicBWT(string, block_size=2)
+        for _ in range(40):
+            text = ''.join(rng.choice(unit) for _ in range(rng.randint(1, 3)))
+            if rng.random() < 0.5:
+                dynamic.append(text)
+                string += text
+            else:
+                dynamic.prepend(text)
+                string = text + string
+            assert dynamic.bwt_encoded == bwt(string)[1], string
+            assert dynamic.dollar_row == dynamic.bwt_encoded.index('$')
+        for start in range(0, len(string) - 3, 5):
+            pattern = string[start:start + 3]
+            assert dynamic.count(pattern) == len(find_all(string, pattern))
+
+
+def test_dynamic_sequence_matches_str():
+    rng = random.Random(220)
+    sequence = DynamicSequence('ACGT' * 10, block_size=3)
+    reference = list('ACGT' * 10)
+    for _ in range(500):
+        operation = rng.random()
+        if operation < 0.4:
+            position = rng.randint(0, len(reference))
+            char = rng.choice('ACGTN')
+            sequence.insert(position, char)
+            reference.insert(position, char)
+        elif operation < 0.7 and reference:
+            position = rng.randrange(len(reference))
+            assert sequence.delete(position) == reference.pop(position)
+        elif reference:
+            position = rng.randrange(len(reference))
+            char = rng.choice('ACGT')
+            assert sequence.replace(position, char) == reference[position]
+            reference[position] = char
+        text = ''.join(reference)
+        assert str(sequence) == text
+        position = rng.randint(0, len(text))
+        for char in 'ACGTN':
+            assert sequence.rank(char, position) == text.count(char, 0, position)
@@ -0,0 +1,65 @@
+# tests/test_fm_index.py
+#-----------------------------------------------------------------#
+#FMIndex count() and locate() checked against a str.find scan of the indexed string,
+#for every sample rate combination, both rank backends and an index rebuilt from the BWT alone.
+#-----------------------------------------------------------------#
+
+import random
+
+import pytest
+
+from bwt_package.core import bwt
+from bwt_package.fm_index import RANK_BACKENDS, FMIndex
+from helpers import find_all, patterns_of, random_strings
+
+#Strings besides the predefined sequences: a single character and a protein
+EXTRA_STRINGS = ["A", "MKVLAAGIVGLLLAQWERTYMKVL"]
+
+
+def indexed_strings(rng):
+    return random_strings(rng) + EXTRA_STRINGS
+
+
+@pytest.mark.parametrize('rank_backend', RANK_BACKENDS)
+@pytest.mark.parametrize('occ_sample_rate, sa_sample_rate', [(1, 1), (3, 5), (32, 32)])
+def test_count_and_locate_match_find(occ_sample_rate, sa_sample_rate, rank_backend):
+    rng = random.Random(8)
+    for string in indexed_strings(rng):
+        index = FMIndex.from_string(string, occ_sample_rate=occ_sample_rate, sa_sample_rate=sa_sample_rate,
+                                    rank_backend=rank_backend)
+        for pattern in patterns_of(string, rng):
+            expected = find_all(string, pattern)
+            assert index.count(pattern) == len(expected), (string, pattern)
+            assert index.locate(pattern) == expected, (string, pattern)
+
+
+def test_samples_recovered_from_bwt_alone():
+    rng = random.Random(80)
+    for string in indexed_strings(rng):
+        index = FMIndex(bwt(string)[1], occ_sample_rate=4, sa_sample_rate=3)
+        for pattern in patterns_of(string, rng):
+            assert index.locate(pattern) == find_all(string, pattern), (string, pattern)
+
+
+def test_saved_index_answers_the_same(tmp_path):
+    string = "ACGTTGCAAGGCT" * 50
+    index = FMIndex.from_string(string, occ_sample_rate=8, sa_sample_rate=4, rank_backend='wavelet')
+    index.save(tmp_path / 'index.bwti')
+    loaded = FMIndex.load(tmp_path / 'index.bwti')
+    for pattern in ['GCAAGG', 'CTA', 'TTT', 'A']:
+        assert loaded.locate(pattern) == index.locate(pattern) == find_all(string, pattern)
+
+
+def test_loaded_index_saves_and_loads_again(tmp_path):
+    string = "ATATGTATACAT" * 20
+    FMIndex.from_string(string, occ_sample_rate=4, sa_sample_rate=3).save(tmp_path / 'first.bwti')
+    with FMIndex.load(tmp_path / 'first.bwti') as loaded:
+        assert sorted(loaded.sa_samples) == [row for row, _ in loaded.sa_samples.items()]
+        loaded.save(tmp_path / 'second.bwti')
+    assert (tmp_path / 'first.bwti').read_bytes() == (tmp_path / 'second.bwti').read_bytes()
+    with FMIndex.load(tmp_path / 'second.bwti') as reloaded:
+        for pattern in ['ATA', 'GTA', 'CATA', 'TT']:
+            assert reloaded.locate(pattern) == find_all(string, pattern)
+    # Closing releases the mapping; closing again does nothing
+    assert reloaded._mapped is None
+    reloaded.close()
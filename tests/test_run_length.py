@@ -0,0 +1,63 @@
+# tests/test_run_length.py
+#-----------------------------------------------------------------#
+#RunLengthBWT rank/select/access checked against the plain BWT string, and count()/locate() (toehold and phi)
+#against a str.find scan, with samples taken from the suffix array and recovered by an LF walk.
+#-----------------------------------------------------------------#
+
+import random
+
+import pytest
+
+from bwt_package.core import bwt
+from bwt_package.run_length import RunLengthBWT, count_runs
+from helpers import find_all, random_strings, repetitive_strings
+
+
+def indexed_strings(rng):
+    # Repetitive strings with a few mutations are the inputs a run-length BWT is meant for
+    fixed = ["A", "GATTACA", "ATATATATATA", "AAAATAAATAAA", "ACGTTGCAAGGCT" * 6]
+    return fixed + repetitive_strings(rng) + random_strings(rng, alphabets=['ACGT'], lengths=[2, 9, 150])
+
+
+def test_rank_select_access_match_bwt():
+    rng = random.Random(24)
+    for string in indexed_strings(rng):
+        bwt_encoded = bwt(string)[1]
+        index = RunLengthBWT.from_string(string)
+        assert index.runs == count_runs(bwt_encoded)
+        for row, char in enumerate(bwt_encoded):
+            assert index.access(row) == char
+        for char in set(bwt_encoded):
+            rows = [row for row, other in enumerate(bwt_encoded) if other == char]
+            for k, row in enumerate(rows):
+                assert index.select(char, k) == row
+            for position in range(len(bwt_encoded) + 1):
+                assert index.rank(char, position) == bwt_encoded.count(char, 0, position)
+
+
+@pytest.mark.parametrize('from_positions', [True, False])
+def test_count_and_locate_match_find(from_positions):
+    rng = random.Random(240)
+    for string in indexed_strings(rng):
+        if from_positions:
+            index = RunLengthBWT.from_string(string)
+        else:
+            # Samples recovered from the BWT alone by one LF walk
+            index = RunLengthBWT(bwt(string)[1])
+        patterns = {string[start:start + length] for start in range(len(string)) for length in (1, 2, 5)}
+        patterns.update([string, 'GGGG', 'N'])
+        for pattern in patterns:
+            expected = find_all(string, pattern)
+            assert index.count(pattern) == len(expected), (string, pattern)
+            assert index.locate(pattern) == expected, (string, pattern)
+
+
+def test_phi_walks_every_row():
+    # phi() of the text position of every row gives the text position of the row above it
+    rng = random.Random(241)
+    for string in indexed_strings(rng):
+        text = string + '$'
+        positions = sorted(range(len(text)), key=lambda i: text[i:])
+        index = RunLengthBWT.from_string(string)
+        for row in range(1, len(positions)):
+            assert index.phi(positions[row]) == positions[row - 1], (string, row)